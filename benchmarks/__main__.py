@@ -0,0 +1,51 @@
+# benchmarks/__main__.py
+"""Запуск замеров: python -m benchmarks [--output results.json] [--save-baseline].
+
+Завершается с кодом 1, если какой-либо замер медленнее базовой линии
+больше чем на допустимую долю. Сравнивается время в долях эталонной
+нагрузки (см. benchmarks/runner.py), поэтому базовая линия не привязана
+к машине, на которой записана.
+"""
+import argparse
+import os
+import sys
+
+from benchmarks.cases import all_cases, reference_case
+from benchmarks.runner import find_regressions, load_baseline, measure, save_json, to_json
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+
+def main() -> int:
+    """Выполняет замеры, печатает результаты и проверяет регрессии."""
+    parser = argparse.ArgumentParser(description="Замеры горячих участков игры.")
+    parser.add_argument("--output", help="Записать результаты в JSON-файл")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="Файл базовой линии")
+    parser.add_argument("--save-baseline", action="store_true", help="Сохранить результаты как базовую линию")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Допустимое замедление (доля)")
+    parser.add_argument("--filter", default="", help="Запускать только замеры, имя которых содержит строку")
+    args = parser.parse_args()
+
+    reference = reference_case()
+    results = []
+    for case in all_cases():
+        if args.filter in case.name:
+            result = measure(case, reference)
+            results.append(result)
+            print(f"{result.name:20} {result.ns_per_op / 1000:12.2f} мкс/оп {result.relative:10.4f} эталона")
+
+    data = to_json(results)
+    if args.output:
+        save_json(args.output, data)
+    if args.save_baseline:
+        save_json(args.baseline, {**load_baseline(args.baseline), **data})
+        return 0
+
+    regressions = find_regressions(results, load_baseline(args.baseline), args.tolerance)
+    for regression in regressions:
+        print(f"Регрессия: {regression}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,166 @@
+# benchmarks/cases.py
+"""Замеры горячих участков движка, AI и отрисовки."""
+import itertools
+import os
+import random
+from typing import List
+
+from benchmarks.runner import BenchmarkCase
+from game.core import CATALOG, Creature, GameField
+from game.engine import GameEngine
+from game.headless import HeadlessEvents, simulate_game
+from game.policies import greedy_policy
+
+
+def headless_engine(seed: int = 0) -> GameEngine:
+    """Безголовый движок с начатой партией."""
+    engine = GameEngine(player_name="Игрок 1", events=HeadlessEvents(), rng=random.Random(seed))
+    engine.start_game()
+    return engine
+
+
+def midgame_engine(seed: int = 0, turns: int = 6) -> GameEngine:
+    """Безголовый движок после нескольких ходов жадных стратегий."""
+    engine = headless_engine(seed)
+    for _ in range(turns):
+        move = greedy_policy(engine, True)
+        if move is not None:
+            engine.play_card(1, move[0], move[1], is_player=True)
+        engine.next_turn()
+    return engine
+
+
+def reference_case() -> BenchmarkCase:
+    """Эталонная нагрузка на чистом Python, не зависящая от кода игры.
+
+    Базовая линия хранит время замеров в долях эталона, поэтому эталон
+    менять нельзя: после изменения базовую линию нужно записывать заново.
+    """
+    def run(_) -> dict:
+        table = {}
+        for value in range(200):
+            key = value % 17
+            table[key] = table.get(key, 0) + value
+        return table
+
+    return BenchmarkCase("reference", run, ops=500)
+
+
+def place_creature_case() -> BenchmarkCase:
+    field = GameField()
+    creature = Creature(0, 1)
+
+    def run(_) -> None:
+        field.place_creature(creature, 3, True)
+        field.remove_creature(3, True)
+
+    return BenchmarkCase("place_creature", run, ops=20000)
+
+
+def play_card_case() -> BenchmarkCase:
+    engine = headless_engine()
+
+    def run(_) -> None:
+        engine.player.mana = 10
+        engine.play_card(1, 3, 0, is_player=True)
+        engine.field.remove_creature(0, True)
+
+    return BenchmarkCase("play_card", run, ops=10000)
+
+
+def resolve_combat_case() -> BenchmarkCase:
+    # У существ огромное здоровье, поэтому поле не меняется между вызовами
+    engine = headless_engine()
+    for is_player, row in ((False, 0), (True, 1)):
+        for slot, card in enumerate(engine.field.grid[row]):
+            engine.field.set_creature(slot, is_player, Creature(CATALOG.intern(card), 10 ** 9, active=True))
+    return BenchmarkCase("resolve_combat", lambda _: engine.resolve_combat(is_player_turn=True), ops=5000)
+
+
+def greedy_policy_case() -> BenchmarkCase:
+    engine = midgame_engine()
+    return BenchmarkCase("greedy_policy", lambda _: greedy_policy(engine, False), ops=10000)
+
+
+def ai_turn_case() -> BenchmarkCase:
+    from game.search import clone_engine
+
+    engine = midgame_engine()
+    rng = random.Random(0)
+    return BenchmarkCase("ai_turn", lambda clone: clone.ai_turn(),
+                         setup=lambda: clone_engine(engine, random.Random(rng.getrandbits(32))), ops=2000)
+
+
+def snapshot_restore_case() -> BenchmarkCase:
+    # Ход в рабочем движке и возврат к снимку, как в итерации MCTS
+    from game.snapshot import restore, spawn, take_snapshot
+
+    root = take_snapshot(midgame_engine())
+    sim = spawn(root, random.Random(0))
+
+    def run(_) -> None:
+        sim.next_turn()
+        restore(sim, root, root)
+
+    return BenchmarkCase("snapshot_restore", run, ops=2000)
+
+
+def full_game_case() -> BenchmarkCase:
+    seeds = itertools.count()
+    return BenchmarkCase("full_game", simulate_game, setup=lambda: next(seeds), ops=200)
+
+
+def gui_cases() -> List[BenchmarkCase]:
+    """Замеры GUI.draw_field под фиктивным видеодрайвером SDL; пусто, если pygame не установлен."""
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    try:
+        import pygame
+    except ImportError:
+        return []
+    from game.gui import GUI
+
+    engine = midgame_engine()
+    gui = GUI(engine)
+    engine.set_gui(gui)
+
+    # Полная перерисовка выполняется в SDL, скорость которого меняется не так, как скорость
+    # интерпретатора, поэтому ее эталон — заливка и копирование поверхностей размером с экран;
+    # кадр без изменений почти целиком выполняется в Python и сравнивается с общим эталоном
+    canvas = pygame.Surface(gui.screen.get_size())
+    tile = pygame.Surface((80, 100))
+
+    def blit_reference(_) -> None:
+        canvas.fill((30, 30, 30))
+        for x in range(0, canvas.get_width(), 80):
+            for y in range(0, canvas.get_height(), 100):
+                canvas.blit(tile, (x, y))
+        gui.screen.blit(canvas, (0, 0))
+
+    reference = BenchmarkCase("blit_reference", blit_reference, ops=100)
+
+    def draw(_) -> None:
+        gui.draw_field()
+        gui.update_display()
+
+    def draw_full(_) -> None:
+        gui.invalidate()
+        draw(None)
+
+    return [
+        BenchmarkCase("draw_field_full", draw_full, ops=200, reference=reference),
+        BenchmarkCase("draw_field_idle", draw, ops=2000),
+    ]
+
+
+def all_cases() -> List[BenchmarkCase]:
+    """Все замеры в порядке запуска."""
+    return [
+        place_creature_case(),
+        play_card_case(),
+        resolve_combat_case(),
+        greedy_policy_case(),
+        ai_turn_case(),
+        snapshot_restore_case(),
+        full_game_case(),
+        *gui_cases(),
+    ]
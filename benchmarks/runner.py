@@ -0,0 +1,135 @@
+# benchmarks/runner.py
+"""Замер времени горячих участков и сравнение с сохраненной базовой линией.
+
+Каждый повтор замеряет весь внутренний цикл одной парой вызовов таймера и
+делит время на число вызовов, поэтому накладные расходы таймера не входят
+во время одного вызова. Рядом с каждым повтором замеряется эталонная
+нагрузка (reference), не зависящая от кода игры; базовая линия хранит
+отношение времени замера к эталону, которое переносится между машинами и
+не зависит от того, насколько быстро машина работает в момент замера.
+"""
+import gc
+import json
+import statistics
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+
+@dataclass
+class BenchmarkCase:
+    """Описание замера.
+
+    Функция setup вызывается для каждого вызова run до начала повтора и не
+    входит в замер; ее результаты передаются в run по порядку. Поэтому setup
+    должна только готовить аргумент, а не менять общее состояние.
+    """
+    name: str
+    run: Callable[[Any], Any]
+    setup: Callable[[], Any] = lambda: None
+    ops: int = 1000        # Число вызовов run в одном повторе
+    repeats: int = 9       # Число повторов; в результат идет медиана
+    reference: Optional['BenchmarkCase'] = None  # Свой эталон, например для кода на C; иначе общий
+
+
+@dataclass
+class BenchmarkResult:
+    """Результат замера: время одного вызова в наносекундах и отношение к эталону."""
+    name: str
+    ns_per_op: float
+    min_ns_per_op: float
+    ops: int
+    repeats: int
+    relative: Optional[float] = None  # Медиана отношения времени вызова к времени вызова эталона
+
+
+def time_loop(case: BenchmarkCase) -> float:
+    """Один повтор: время одного вызова run в наносекундах по замеру всего цикла.
+
+    Сборщик мусора на время цикла отключается, как в timeit.
+    """
+    run = case.run
+    args = [case.setup() for _ in range(case.ops)]
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        start = time.perf_counter_ns()
+        for arg in args:
+            run(arg)
+        elapsed = time.perf_counter_ns() - start
+    finally:
+        if enabled:
+            gc.enable()
+    return elapsed / case.ops
+
+
+def measure(case: BenchmarkCase, reference: Optional[BenchmarkCase] = None) -> BenchmarkResult:
+    """Выполняет замер и возвращает медиану и минимум времени одного вызова.
+
+    Аргументы:
+        case (BenchmarkCase): Замер.
+        reference (BenchmarkCase, optional): Эталонная нагрузка, если у замера нет своей; замеряется
+            до и после каждого повтора, и в результат идет медиана отношений к среднему этих двух замеров.
+    """
+    reference = case.reference or reference
+    samples: List[float] = []
+    ratios: List[float] = []
+    reference_ns = time_loop(reference) if reference is not None else None
+    for _ in range(case.repeats):
+        samples.append(time_loop(case))
+        if reference is not None:
+            before, reference_ns = reference_ns, time_loop(reference)
+            ratios.append(2 * samples[-1] / (before + reference_ns))
+    relative = statistics.median(ratios) if ratios else None
+    return BenchmarkResult(case.name, statistics.median(samples), min(samples), case.ops, case.repeats, relative)
+
+
+def to_json(results: List[BenchmarkResult]) -> Dict[str, Dict[str, float]]:
+    """Преобразует результаты в словарь для записи в JSON."""
+    return {result.name: asdict(result) for result in results}
+
+
+def load_baseline(path: str) -> Dict[str, Dict[str, float]]:
+    """Читает сохраненную базовую линию; отсутствующий файл — пустая линия."""
+    try:
+        with open(path, encoding="utf-8") as file:
+            return json.load(file)
+    except FileNotFoundError:
+        return {}
+
+
+def save_json(path: str, data: Dict[str, Dict[str, float]]) -> None:
+    """Записывает результаты в JSON-файл."""
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(data, file, ensure_ascii=False, indent=2, sort_keys=True)
+        file.write("\n")
+
+
+def find_regressions(results: List[BenchmarkResult], baseline: Dict[str, Dict[str, float]],
+                     tolerance: float) -> List[str]:
+    """Возвращает описания замеров, ставших медленнее базовой линии больше чем на tolerance.
+
+    Сравниваются отношения к эталону (relative); время в наносекундах
+    сравнивается, только если у результата или базовой линии отношения нет.
+
+    Аргументы:
+        results (List[BenchmarkResult]): Текущие результаты.
+        baseline (Dict): Базовая линия в формате to_json.
+        tolerance (float): Допустимое относительное замедление, например 0.25.
+    """
+    regressions = []
+    for result in results:
+        reference: Optional[Dict[str, float]] = baseline.get(result.name)
+        if reference is None:
+            continue
+        if result.relative is not None and reference.get("relative") is not None:
+            limit = reference["relative"] * (1 + tolerance)
+            if result.relative > limit:
+                regressions.append(f"{result.name}: {result.relative:.3f} эталона > {limit:.3f} "
+                                   f"(база {reference['relative']:.3f})")
+            continue
+        limit = reference["ns_per_op"] * (1 + tolerance)
+        if result.ns_per_op > limit:
+            regressions.append(f"{result.name}: {result.ns_per_op:.0f} нс > {limit:.0f} нс "
+                               f"(база {reference['ns_per_op']:.0f} нс)")
+    return regressions
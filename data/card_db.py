@@ -0,0 +1,295 @@
+# data/card_db.py
+"""База карт: исходный CSV-файл и его скомпилированный двоичный кэш.
+
+Исходник — data/cards.csv со столбцами name, mana_cost, attack, health;
+id карты — номер строки данных (с нуля). При загрузке исходник один раз
+компилируется в data/cards.bin, который затем отображается в память.
+Кэш пересобирается, только если изменились размер или время изменения исходника.
+
+Кэш содержит, помимо характеристик и названий, вторичные индексы:
+    by_cost      — id, упорядоченные по (стоимость, -атака, id);
+    cost_offsets — начало каждой стоимости в by_cost;
+    by_attack    — id, упорядоченные по (-атака, id).
+
+Генерация большого исходника для экспериментов:
+    python -m data.card_db --generate 50000 pool.csv
+"""
+import csv
+import heapq
+import mmap
+import os
+import random
+import struct
+import tempfile
+from array import array
+from typing import Dict, Iterator, List, Optional, Sequence
+
+from game.core import Card
+
+DATA_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_SOURCE = os.path.join(DATA_DIR, "cards.csv")
+
+MAGIC = b"CRDB"
+VERSION = 1
+NAME_WIDTH = 32  # Байт UTF-8 на название карты
+# Сигнатура, версия, время изменения и размер исходника, число карт, максимальная стоимость
+HEADER = struct.Struct("=4sHqqII")
+STATS = struct.Struct("=hhh")  # Стоимость, атака, здоровье
+
+
+def _align(offset: int) -> int:
+    """Выравнивает смещение по 8 байтам."""
+    return (offset + 7) & ~7
+
+
+class CardDatabase:
+    """Скомпилированная база карт, отображенная в память."""
+
+    def __init__(self, path: str) -> None:
+        """Открывает скомпилированный кэш.
+
+        Аргументы:
+            path (str): Путь к файлу кэша.
+        """
+        with open(path, "rb") as file:
+            self.buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, _, _, self.count, self.max_cost = HEADER.unpack_from(self.buffer, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"Неверный формат кэша базы карт: {path}")
+
+        view = memoryview(self.buffer)
+        offset = _align(HEADER.size)
+        self.stats_offset = offset
+        offset = _align(offset + STATS.size * self.count)
+        self.names_offset = offset
+        offset = _align(offset + NAME_WIDTH * self.count)
+        self.by_cost = view[offset:offset + 4 * self.count].cast("I")
+        offset = _align(offset + 4 * self.count)
+        self.cost_offsets = view[offset:offset + 4 * (self.max_cost + 2)].cast("I")
+        offset = _align(offset + 4 * (self.max_cost + 2))
+        self.by_attack = view[offset:offset + 4 * self.count].cast("I")
+        self.cards: Dict[int, Card] = {}
+        self.ids: Dict[Card, int] = {}
+
+    def __len__(self) -> int:
+        return self.count
+
+    def stats(self, card_id: int) -> tuple[int, int, int]:
+        """Стоимость, атака и здоровье карты без создания объекта Card."""
+        return STATS.unpack_from(self.buffer, self.stats_offset + STATS.size * card_id)
+
+    def name(self, card_id: int) -> str:
+        """Название карты."""
+        start = self.names_offset + NAME_WIDTH * card_id
+        return self.buffer[start:start + NAME_WIDTH].rstrip(b"\0").decode("utf-8")
+
+    def card(self, card_id: int) -> Card:
+        """Описание карты по id; объекты Card создаются один раз."""
+        card = self.cards.get(card_id)
+        if card is None:
+            if not 0 <= card_id < self.count:
+                raise IndexError(f"Нет карты с id {card_id}")
+            card = Card(self.name(card_id), *self.stats(card_id))
+            self.cards[card_id] = card
+            self.ids.setdefault(card, card_id)
+        return card
+
+    def card_id(self, card: Card) -> int:
+        """Id строки базы для описания карты; в отличие от id в CATALOG, не зависит от процесса.
+
+        Исключения:
+            KeyError: Если такой карты в базе нет.
+        """
+        card_id = self.ids.get(card)
+        if card_id is None:
+            stats = (card.mana_cost, card.attack, card.health)
+            card_id = next((row for row in self.with_cost(card.mana_cost)
+                            if self.stats(row) == stats and self.name(row) == card.name), None)
+            if card_id is None:
+                raise KeyError(f"Карты нет в базе: {card}")
+            self.ids[card] = card_id
+        return card_id
+
+    def with_cost(self, mana_cost: int) -> Sequence[int]:
+        """Id карт с данной стоимостью, по убыванию атаки."""
+        if not 0 <= mana_cost <= self.max_cost:
+            return []
+        return self.by_cost[self.cost_offsets[mana_cost]:self.cost_offsets[mana_cost + 1]]
+
+    def affordable(self, mana: int) -> Iterator[int]:
+        """Id карт со стоимостью не выше mana, по убыванию атаки.
+
+        Слияние уже отсортированных групп по стоимости, поэтому первые
+        результаты доступны без просмотра всей базы.
+        """
+        groups = [self.with_cost(cost) for cost in range(min(mana, self.max_cost) + 1)]
+        return heapq.merge(*groups, key=lambda card_id: (-self.stats(card_id)[1], card_id))
+
+    def strongest(self, limit: int) -> Sequence[int]:
+        """Id limit карт с наибольшей атакой."""
+        return self.by_attack[:limit]
+
+    def random_deck(self, rng: random.Random, size: int = 8, max_cost: Optional[int] = None,
+                    curve: Optional[Sequence[int]] = None) -> List[Card]:
+        """Случайная колода для строки сетки.
+
+        Аргументы:
+            rng (random.Random): Генератор случайных чисел.
+            size (int): Число карт.
+            max_cost (int, optional): Максимальная стоимость карты.
+            curve (Sequence[int], optional): Стоимость карты на каждой позиции колоды;
+                если задана, определяет и размер колоды.
+
+        Исключения:
+            ValueError: Если ограничениям не удовлетворяет ни одна карта.
+        """
+        if curve is not None:
+            deck = []
+            for cost in curve:
+                group = self.with_cost(cost)
+                if not group:
+                    raise ValueError(f"Нет карт стоимостью {cost}")
+                deck.append(self.card(group[rng.randrange(len(group))]))
+            return deck
+        return [self.card(card_id) for card_id in self.random_ids(rng, size, max_cost)]
+
+    def random_ids(self, rng: random.Random, size: int = 8, max_cost: Optional[int] = None) -> List[int]:
+        """Id size случайных карт (с повторами) стоимостью не выше max_cost.
+
+        Исключения:
+            ValueError: Если ограничению не удовлетворяет ни одна карта.
+        """
+        if max_cost is None:
+            limit = self.count
+        else:
+            limit = self.cost_offsets[min(max(max_cost, -1), self.max_cost) + 1]
+        if limit == 0:
+            raise ValueError(f"Нет карт стоимостью до {max_cost}")
+        return [self.by_cost[rng.randrange(limit)] for _ in range(size)]
+
+    def close(self) -> None:
+        """Освобождает отображения памяти."""
+        for view in (self.by_cost, self.cost_offsets, self.by_attack):
+            view.release()
+        self.buffer.close()
+
+
+def read_source(source: str) -> List[tuple[str, int, int, int]]:
+    """Читает исходный CSV-файл в список (название, стоимость, атака, здоровье)."""
+    with open(source, encoding="utf-8", newline="") as file:
+        return [(row["name"], int(row["mana_cost"]), int(row["attack"]), int(row["health"]))
+                for row in csv.DictReader(file)]
+
+
+def compile_cache(source: str, cache: str) -> None:
+    """Компилирует CSV-файл в двоичный кэш с индексами.
+
+    Исключения:
+        ValueError: Если название карты длиннее NAME_WIDTH байт.
+    """
+    rows = read_source(source)
+    stat = os.stat(source)
+    count = len(rows)
+    max_cost = max((row[1] for row in rows), default=0)
+
+    by_cost = sorted(range(count), key=lambda i: (rows[i][1], -rows[i][2], i))
+    cost_offsets = [0] * (max_cost + 2)
+    for _, mana_cost, _, _ in rows:
+        cost_offsets[mana_cost + 1] += 1
+    for cost in range(1, max_cost + 2):
+        cost_offsets[cost] += cost_offsets[cost - 1]
+    by_attack = sorted(range(count), key=lambda i: (-rows[i][2], i))
+
+    out = bytearray(HEADER.pack(MAGIC, VERSION, stat.st_mtime_ns, stat.st_size, count, max_cost))
+    out.extend(bytes(_align(len(out)) - len(out)))
+    for _, mana_cost, attack, health in rows:
+        out.extend(STATS.pack(mana_cost, attack, health))
+    out.extend(bytes(_align(len(out)) - len(out)))
+    for name, _, _, _ in rows:
+        encoded = name.encode("utf-8")
+        if len(encoded) > NAME_WIDTH:
+            raise ValueError(f"Название карты длиннее {NAME_WIDTH} байт: {name}")
+        out.extend(encoded.ljust(NAME_WIDTH, b"\0"))
+    for values in (by_cost, cost_offsets, by_attack):
+        out.extend(bytes(_align(len(out)) - len(out)))
+        out.extend(array("I", values).tobytes())
+
+    # Несколько процессов могут собирать кэш одновременно: каждый пишет во временный файл
+    # с уникальным именем и атомарно подменяет им кэш; содержимое у всех одинаковое
+    handle, temp = tempfile.mkstemp(prefix=os.path.basename(cache) + ".", suffix=".tmp",
+                                    dir=os.path.dirname(os.path.abspath(cache)))
+    try:
+        with os.fdopen(handle, "wb") as file:
+            file.write(out)
+        try:
+            os.replace(temp, cache)
+        except PermissionError:
+            # Windows не дает подменить файл, открытый другим процессом; если тот процесс
+            # уже записал свежий кэш, гонка проиграна без последствий
+            if not is_fresh(source, cache):
+                raise
+    finally:
+        if os.path.exists(temp):
+            os.remove(temp)
+
+
+def is_fresh(source: str, cache: str) -> bool:
+    """Проверяет, собран ли кэш из текущей версии исходника."""
+    try:
+        with open(cache, "rb") as file:
+            header = file.read(HEADER.size)
+        magic, version, mtime_ns, size, _, _ = HEADER.unpack(header)
+    except (OSError, struct.error):
+        return False
+    stat = os.stat(source)
+    return magic == MAGIC and version == VERSION and mtime_ns == stat.st_mtime_ns and size == stat.st_size
+
+
+def load_database(source: str = DEFAULT_SOURCE, cache: Optional[str] = None) -> CardDatabase:
+    """Открывает базу карт, пересобирая кэш, если исходник изменился.
+
+    Аргументы:
+        source (str): Путь к CSV-файлу карт.
+        cache (str, optional): Путь к кэшу; по умолчанию — рядом с исходником с расширением .bin.
+    """
+    cache = cache or os.path.splitext(source)[0] + ".bin"
+    if not is_fresh(source, cache):
+        compile_cache(source, cache)
+    return CardDatabase(cache)
+
+
+_default: Optional[CardDatabase] = None
+
+
+def default_database() -> CardDatabase:
+    """База карт игры из data/cards.csv, открываемая один раз на процесс."""
+    global _default
+    if _default is None:
+        _default = load_database()
+    return _default
+
+
+def generate_source(path: str, count: int, seed: int = 0, max_cost: int = 10) -> None:
+    """Записывает CSV-файл со случайными картами для экспериментов с большим пулом."""
+    rng = random.Random(seed)
+    with open(path, "w", encoding="utf-8", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(["name", "mana_cost", "attack", "health"])
+        for card_id in range(count):
+            mana_cost = rng.randint(1, max_cost)
+            budget = 2 * mana_cost + 1
+            attack = rng.randint(0, budget)
+            writer.writerow([f"Карта {card_id}", mana_cost, attack, max(1, budget - attack)])
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="База карт: генерация исходника и сборка кэша.")
+    parser.add_argument("--generate", type=int, metavar="N", help="Сгенерировать N случайных карт")
+    parser.add_argument("source", nargs="?", default=DEFAULT_SOURCE, help="CSV-файл карт")
+    args = parser.parse_args()
+    if args.generate:
+        generate_source(args.source, args.generate)
+    database = load_database(args.source)
+    print(f"{args.source}: {len(database)} карт, стоимость до {database.max_cost}")
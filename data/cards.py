@@ -1,36 +1,44 @@
-from typing import List
-from game.core import Card
+import random
+from typing import List, Optional, Sequence
+from game.core import Card, CATALOG
+from data.card_db import default_database
+
+# Id карт стартовых колод в базе data/cards.csv
+OPPONENT_DECK = range(0, 8)   # Карты для оппонента (верхняя строка, row 0)
+PLAYER_DECK = range(8, 16)    # Карты для игрока (нижняя строка, row 1)
+
+
+def make_grid(opponent_cards: List[Card], player_cards: List[Card]) -> List[List[Card]]:
+    """Формирует сетку 8x2 из двух колод и регистрирует их карты в CATALOG.
+
+    Карты регистрируются заранее, чтобы их id не зависели от порядка розыгрыша (нужно для реплеев).
+    """
+    grid: List[List[Card]] = [opponent_cards, player_cards]
+    for card in opponent_cards + player_cards:
+        CATALOG.intern(card)
+    return grid
+
 
 def get_initial_grid() -> List[List[Card]]:
-    """Создает статичную сетку карт 8x2.
+    """Создает стартовую сетку карт 8x2 из базы карт.
 
     Возвращает:
         List[List[Card]]: Сетка 8x2 (верхняя строка — оппонент, нижняя — игрок).
     """
-    # Карты для оппонента (верхняя строка, row 0)
-    opponent_cards = [
-        Card("Гоблин", mana_cost=1, attack=2, health=1),
-        Card("Орк", mana_cost=2, attack=3, health=2),
-        Card("Тролль", mana_cost=3, attack=4, health=3),
-        Card("Дракон", mana_cost=4, attack=6, health=5),
-        Card("Крыса", mana_cost=1, attack=1, health=1),
-        Card("Волк", mana_cost=2, attack=2, health=3),
-        Card("Медведь", mana_cost=3, attack=3, health=4),
-        Card("Огр", mana_cost=4, attack=5, health=4),
-    ]
-
-    # Карты для игрока (нижняя строка, row 1)
-    player_cards = [
-        Card("Скелет", mana_cost=1, attack=1, health=2),
-        Card("Зомби", mana_cost=2, attack=2, health=2),
-        Card("Призрак", mana_cost=3, attack=3, health=1),
-        Card("Вампир", mana_cost=4, attack=4, health=4),
-        Card("Кот", mana_cost=1, attack=1, health=1),
-        Card("Собака", mana_cost=2, attack=2, health=2),
-        Card("Бык", mana_cost=3, attack=3, health=3),
-        Card("Лев", mana_cost=4, attack=5, health=5),
-    ]
-
-    # Формируем сетку 8x2
-    grid: List[List[Card]] = [opponent_cards, player_cards]
-    return grid
\ No newline at end of file
+    database = default_database()
+    return make_grid([database.card(card_id) for card_id in OPPONENT_DECK],
+                     [database.card(card_id) for card_id in PLAYER_DECK])
+
+
+def get_random_grid(rng: random.Random, max_cost: Optional[int] = None,
+                    curve: Optional[Sequence[int]] = None) -> List[List[Card]]:
+    """Создает сетку 8x2 из случайных колод базы карт.
+
+    Аргументы:
+        rng (random.Random): Генератор случайных чисел.
+        max_cost (int, optional): Максимальная стоимость карты.
+        curve (Sequence[int], optional): Стоимость карты на каждой из 8 позиций колоды.
+    """
+    database = default_database()
+    return make_grid(database.random_deck(rng, max_cost=max_cost, curve=curve),
+                     database.random_deck(rng, max_cost=max_cost, curve=curve))
\ No newline at end of file
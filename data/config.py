@@ -12,4 +12,8 @@ YELLOW = (255, 255, 0)   # Активные существа
 # Задержки (в миллисекундах)
 DELAY_BETWEEN_ACTIONS = 1500    # Задержка между действиями (например, атака)
 DELAY_BEFORE_REMOVE = 2000     # Задержка перед удалением убитых существ
-DELAY_AI_ACTION = 700          # Задержка перед действиями AI
\ No newline at end of file
+DELAY_AI_ACTION = 700          # Задержка перед действиями AI
+
+# Частота кадров
+FPS = 60       # Частота кадров при вводе и изменениях на экране
+IDLE_FPS = 10  # Частота опроса событий, пока на экране ничего не меняется
\ No newline at end of file
@@ -0,0 +1,338 @@
+# game/analytics.py
+"""Потоковая статистика баланса карт по симулированным партиям.
+
+Каждая партия разбирается по событиям шины (GameTracker), а ее итог сразу
+складывается в накопители фиксированного размера (CardStats): массивы по
+id строки базы карт (как в реплеях, id не зависит от процесса), по паре (карта, слот) и по корзине кривой маны. Размер
+накопителей зависит только от числа карт, поэтому 10 миллионов партий
+занимают столько же памяти, сколько 10 тысяч. Накопители рабочих
+процессов складываются через CardStats.merge.
+
+Для каждой карты считаются: розыгрыши, победы и поражения разыгравшей
+стороны, нанесенный урон (существам и игроку), число ходов на поле и число
+гибелей. Кривая маны стороны в партии — средняя стоимость разыгранных ею
+карт, округленная до целого (0 — не разыграно ничего).
+
+Запуск:
+    python -m game.analytics greedy random --games 1000000 --workers 8 --output balance.npz --csv balance.csv
+"""
+import csv
+from typing import Dict, Iterator, List, Optional
+
+import numpy as np
+
+from data.card_db import default_database
+from game.bus import CardPlayed, CreatureAttacked, CreatureCounterattacked, CreatureRemoved, PlayerDamaged
+from game.core import CATALOG, Creature
+from game.engine import GameEngine
+from game.headless import play_seeded_match, run_batches
+
+MAX_CURVE = 10      # Последняя корзина кривой маны
+FLUSH_SIZE = 4096   # Розыгрышей в буфере до сброса в массивы
+
+CARD_COUNTERS = ("plays", "wins", "losses", "damage", "survival", "deaths")
+SLOT_COUNTERS = ("slot_plays", "slot_wins")
+CURVE_COUNTERS = ("curve_games", "curve_wins")
+
+# Розыгрыш в буфере: (id строки базы, слот, итог для разыгравшей стороны, урон, ходов на поле, погибла ли)
+PlayRow = tuple[int, int, int, int, int, int]
+
+
+class CardStats:
+    """Накопители статистики карт.
+
+    Аргументы:
+        cards (int): Начальное число карт; массивы растут, если встречается карта с большим id.
+    """
+
+    def __init__(self, cards: int = 0) -> None:
+        self.games = 0
+        self.names: List[str] = []
+        self.costs: List[int] = []
+        # Счетчики по картам (cards,), по картам и слотам (cards, 8) и по корзинам кривой маны
+        for name in CARD_COUNTERS:
+            setattr(self, name, np.zeros(0, dtype=np.int64))
+        for name in SLOT_COUNTERS:
+            setattr(self, name, np.zeros((0, 8), dtype=np.int64))
+        for name in CURVE_COUNTERS:
+            setattr(self, name, np.zeros(MAX_CURVE + 1, dtype=np.int64))
+        self.pending: List[PlayRow] = []
+        self.pending_curves: List[tuple[int, int]] = []  # (корзина кривой, итог стороны)
+        self.grow(cards)
+
+    @property
+    def cards(self) -> int:
+        """Число карт в накопителях."""
+        return len(self.plays)
+
+    def counters(self) -> Dict[str, np.ndarray]:
+        """Все массивы-счетчики по именам."""
+        return {name: getattr(self, name) for name in CARD_COUNTERS + SLOT_COUNTERS + CURVE_COUNTERS}
+
+    def grow(self, cards: int) -> None:
+        """Расширяет массивы по картам до cards строк; названия берутся из базы карт."""
+        old = self.cards
+        if cards <= old:
+            return
+        for name in CARD_COUNTERS + SLOT_COUNTERS:
+            array = getattr(self, name)
+            grown = np.zeros((cards,) + array.shape[1:], dtype=np.int64)
+            grown[:old] = array
+            setattr(self, name, grown)
+        database = default_database()
+        for card_id in range(len(self.names), cards):
+            known = card_id < len(database)
+            self.names.append(database.name(card_id) if known else "")
+            self.costs.append(database.stats(card_id)[0] if known else -1)
+
+    def record_game(self, plays: List[PlayRow], curves: List[tuple[int, int]]) -> None:
+        """Добавляет розыгрыши и кривые сторон одной партии."""
+        self.games += 1
+        self.pending.extend(plays)
+        self.pending_curves.extend(curves)
+        if len(self.pending) >= FLUSH_SIZE:
+            self.flush()
+
+    def flush(self) -> None:
+        """Переносит буфер розыгрышей в массивы."""
+        if self.pending:
+            rows = np.array(self.pending, dtype=np.int64)
+            self.pending.clear()
+            cards, slots, outcomes = rows[:, 0], rows[:, 1], rows[:, 2]
+            self.grow(int(cards.max()) + 1)
+            won = outcomes == 1
+            np.add.at(self.plays, cards, 1)
+            np.add.at(self.wins, cards, won)
+            np.add.at(self.losses, cards, outcomes == -1)
+            np.add.at(self.damage, cards, rows[:, 3])
+            np.add.at(self.survival, cards, rows[:, 4])
+            np.add.at(self.deaths, cards, rows[:, 5])
+            np.add.at(self.slot_plays, (cards, slots), 1)
+            np.add.at(self.slot_wins, (cards, slots), won)
+        if self.pending_curves:
+            curves = np.array(self.pending_curves, dtype=np.int64)
+            self.pending_curves.clear()
+            np.add.at(self.curve_games, curves[:, 0], 1)
+            np.add.at(self.curve_wins, curves[:, 0], curves[:, 1] == 1)
+
+    def merge(self, other: 'CardStats') -> 'CardStats':
+        """Прибавляет накопители другого экземпляра (например, рабочего процесса) к этому."""
+        self.flush()
+        other.flush()
+        self.grow(other.cards)
+        for card_id in range(other.cards):
+            if not self.names[card_id]:
+                self.names[card_id], self.costs[card_id] = other.names[card_id], other.costs[card_id]
+        for name, array in other.counters().items():
+            getattr(self, name)[:len(array)] += array
+        self.games += other.games
+        return self
+
+    @staticmethod
+    def rate(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+        """Поэлементное отношение; NaN там, где знаменатель равен нулю."""
+        return np.divide(numerator, denominator, out=np.full(numerator.shape, np.nan), where=denominator > 0)
+
+    def save_npz(self, path: str) -> None:
+        """Записывает накопители в сжатый файл .npz (по массиву на столбец)."""
+        self.flush()
+        np.savez_compressed(path, games=np.int64(self.games), names=np.array(self.names),
+                            costs=np.array(self.costs, dtype=np.int64), **self.counters())
+
+    @classmethod
+    def load_npz(cls, path: str) -> 'CardStats':
+        """Читает накопители, записанные save_npz; результат можно объединять через merge."""
+        stats = cls()
+        with np.load(path) as data:
+            stats.games = int(data["games"])
+            stats.names = [str(name) for name in data["names"]]
+            stats.costs = [int(cost) for cost in data["costs"]]
+            for name in stats.counters():
+                setattr(stats, name, data[name].astype(np.int64))
+        return stats
+
+    def save_csv(self, path: str) -> None:
+        """Записывает таблицу по картам: итоги, средние и доля побед по слотам."""
+        self.flush()
+        win_rate = self.rate(self.wins, self.plays)
+        damage = self.rate(self.damage, self.plays)
+        survival = self.rate(self.survival, self.plays)
+        slot_rates = self.rate(self.slot_wins, self.slot_plays)
+        with open(path, "w", encoding="utf-8", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(["card_id", "name", "mana_cost", "plays", "wins", "losses", "win_rate",
+                             "damage_per_play", "turns_on_board", "deaths"] + [f"slot{slot}_win_rate" for slot in range(8)])
+            for card_id in range(self.cards):
+                writer.writerow([card_id, self.names[card_id], self.costs[card_id], self.plays[card_id],
+                                 self.wins[card_id], self.losses[card_id], f"{win_rate[card_id]:.4f}",
+                                 f"{damage[card_id]:.3f}", f"{survival[card_id]:.3f}", self.deaths[card_id]]
+                                + [f"{rate:.4f}" for rate in slot_rates[card_id]])
+
+
+class GameTracker:
+    """Сбор событий одной партии для CardStats.
+
+    Подключается к движку через attach(engine) (например, как наблюдатель
+    simulate_game), а после конца партии finish() передает ее розыгрыши в
+    накопители. Один экземпляр используется для партий по очереди.
+    """
+
+    def __init__(self, stats: CardStats) -> None:
+        self.stats = stats
+        self.engine: Optional[GameEngine] = None
+        self.database = default_database()
+        self.row_ids: Dict[int, int] = {}  # id в CATALOG -> id строки базы
+        # Розыгрыши партии: [сторона игрока, id карты в CATALOG, слот, урон, ход розыгрыша, ход удаления или -1]
+        self.plays: List[list] = []
+        self.by_creature: Dict[Creature, int] = {}
+        self.by_slot: Dict[tuple[bool, int], int] = {}
+
+    def attach(self, engine: GameEngine) -> None:
+        """Подписывается на события движка новой партии."""
+        self.engine = engine
+        self.plays.clear()
+        self.by_creature.clear()
+        self.by_slot.clear()
+        bus = engine.bus
+        bus.subscribe(CardPlayed, self.on_card_played)
+        bus.subscribe(CreatureAttacked, self.on_attacked)
+        bus.subscribe(CreatureCounterattacked, self.on_counterattacked)
+        bus.subscribe(PlayerDamaged, self.on_player_damaged)
+        bus.subscribe(CreatureRemoved, self.on_removed)
+
+    def on_card_played(self, event: CardPlayed) -> None:
+        index = len(self.plays)
+        self.by_creature[event.creature] = index
+        self.by_slot[(event.is_player, event.slot)] = index
+        self.plays.append([event.is_player, event.creature.card_id, event.slot, 0, self.engine.turn, -1])
+
+    def on_attacked(self, event: CreatureAttacked) -> None:
+        self.plays[self.by_creature[event.attacker]][3] += event.attacker.attack
+
+    def on_counterattacked(self, event: CreatureCounterattacked) -> None:
+        self.plays[self.by_creature[event.defender]][3] += event.defender.attack
+
+    def on_player_damaged(self, event: PlayerDamaged) -> None:
+        self.plays[self.by_creature[event.attacker]][3] += event.attacker.attack
+
+    def on_removed(self, event: CreatureRemoved) -> None:
+        self.plays[self.by_slot.pop((event.is_player, event.slot))][5] = self.engine.turn
+
+    def finish(self, winner: Optional[str]) -> None:
+        """Передает розыгрыши законченной партии в накопители.
+
+        Аргументы:
+            winner (str, optional): "player", "opponent" или None при ничьей.
+        """
+        last_turn = self.engine.turn
+        outcomes = {True: 0, False: 0}
+        if winner is not None:
+            outcomes[True] = 1 if winner == "player" else -1
+            outcomes[False] = -outcomes[True]
+        spent = {True: 0, False: 0}
+        counts = {True: 0, False: 0}
+        cards = CATALOG.cards
+
+        rows: List[PlayRow] = []
+        for is_player, card_id, slot, damage, played, removed in self.plays:
+            died = removed >= 0
+            rows.append((self.row_id(card_id), slot, outcomes[is_player], damage,
+                         (removed if died else last_turn) - played, died))
+            spent[is_player] += cards[card_id].mana_cost
+            counts[is_player] += 1
+        curves = [(min(MAX_CURVE, round(spent[side] / counts[side])) if counts[side] else 0, outcomes[side])
+                  for side in (True, False)]
+        self.stats.record_game(rows, curves)
+        self.engine = None
+
+    def row_id(self, catalog_id: int) -> int:
+        """Id строки базы для карты с данным id в CATALOG."""
+        row_id = self.row_ids.get(catalog_id)
+        if row_id is None:
+            row_id = self.row_ids[catalog_id] = self.database.card_id(CATALOG.cards[catalog_id])
+        return row_id
+
+
+def analyze_batch(args: tuple[str, str, int, int]) -> CardStats:
+    """Играет партии с зернами start..stop-1 в рабочем процессе и возвращает их накопители.
+
+    Стороны распределяет play_seeded_match: при четном зерне стратегия A играет за игрока.
+    """
+    policy_a, policy_b, start, stop = args
+    stats = CardStats()
+    tracker = GameTracker(stats)
+    for seed in range(start, stop):
+        _, result = play_seeded_match(seed, policy_a, policy_b, observers=(tracker,))
+        tracker.finish(result.winner)
+    stats.flush()
+    return stats
+
+
+def seed_ranges(policy_a: str, policy_b: str, start: int, games: int,
+                batch_size: int) -> Iterator[tuple[str, str, int, int]]:
+    """Делит зерна на диапазоны для рабочих процессов (без списков зерен в памяти)."""
+    for first in range(start, start + games, batch_size):
+        yield policy_a, policy_b, first, min(first + batch_size, start + games)
+
+
+def run_analysis(policy_a: str, policy_b: str, games: int, seed: int = 0,
+                 workers: int = 0, batch_size: int = 1024) -> CardStats:
+    """Играет партии и собирает статистику карт, объединяя накопители по мере готовности.
+
+    Аргументы:
+        policy_a (str): Имя первой стратегии.
+        policy_b (str): Имя второй стратегии.
+        games (int): Число партий.
+        seed (int): Зерно первой партии.
+        workers (int): Число процессов; 0 — по числу ядер, 1 — без пула.
+        batch_size (int): Число партий в одном задании процессу.
+    """
+    total = CardStats()
+    jobs = seed_ranges(policy_a, policy_b, seed, games, batch_size)
+    for stats in run_batches(analyze_batch, jobs, workers):
+        total.merge(stats)
+    return total
+
+
+def main() -> None:
+    """Разбирает аргументы командной строки, собирает статистику и печатает сводку по картам."""
+    import argparse
+    import time
+
+    from game.policies import POLICIES
+
+    parser = argparse.ArgumentParser(description="Статистика баланса карт по симулированным партиям.")
+    parser.add_argument("policy_a", choices=sorted(POLICIES), help="Первая стратегия")
+    parser.add_argument("policy_b", choices=sorted(POLICIES), help="Вторая стратегия")
+    parser.add_argument("--games", type=int, default=10000, help="Число партий")
+    parser.add_argument("--seed", type=int, default=0, help="Зерно первой партии")
+    parser.add_argument("--workers", type=int, default=0, help="Число процессов (0 — по числу ядер)")
+    parser.add_argument("--batch-size", type=int, default=1024, help="Партий в одном задании")
+    parser.add_argument("--output", help="Записать накопители в файл .npz")
+    parser.add_argument("--csv", help="Записать таблицу по картам в CSV")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    stats = run_analysis(args.policy_a, args.policy_b, args.games, seed=args.seed,
+                         workers=args.workers, batch_size=args.batch_size)
+    elapsed = time.perf_counter() - start
+    if args.output:
+        stats.save_npz(args.output)
+    if args.csv:
+        stats.save_csv(args.csv)
+
+    win_rate = stats.rate(stats.wins, stats.plays)
+    damage = stats.rate(stats.damage, stats.plays)
+    survival = stats.rate(stats.survival, stats.plays)
+    print(f"{'Карта':24} {'Мана':>4} {'Розыгр.':>9} {'Победы':>7} {'Урон':>6} {'Ходов':>6}")
+    for card_id in range(stats.cards):
+        print(f"{stats.names[card_id]:24} {stats.costs[card_id]:4} {stats.plays[card_id]:9} "
+              f"{win_rate[card_id]:7.1%} {damage[card_id]:6.2f} {survival[card_id]:6.2f}")
+    curve_rate = stats.rate(stats.curve_wins, stats.curve_games)
+    print("Кривая маны: " + ", ".join(f"{cost}: {rate:.1%} ({count})" for cost, (rate, count)
+                                      in enumerate(zip(curve_rate, stats.curve_games)) if count))
+    print(f"Партий: {stats.games} за {elapsed:.2f} с ({stats.games / elapsed:.0f} партий/с)")
+
+
+if __name__ == "__main__":
+    main()
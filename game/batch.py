@@ -0,0 +1,129 @@
+# game/batch.py
+"""Пакетный движок боя: поля тысяч партий в массивах NumPy.
+
+Состояние N партий хранится в массивах формы (N, 2, 8): индекс стороны
+совпадает со строкой сетки (0 — оппонент, 1 — игрок), индекс слота — со
+слотом на поле. Бой разрешается целиком операциями над массивами и дает
+тот же результат, что GameEngine.resolve_combat с HeadlessEvents
+(сверка — tests/test_batch.py).
+"""
+import random
+from typing import List, Sequence
+
+import numpy as np
+
+from game.engine import GameEngine
+
+SIDE_OPPONENT = 0
+SIDE_PLAYER = 1
+
+
+class BatchBoard:
+    """Поля и здоровье игроков для N одновременных партий."""
+
+    def __init__(self, games: int) -> None:
+        """Создает N пустых полей.
+
+        Аргументы:
+            games (int): Число партий в пакете.
+        """
+        self.attack = np.zeros((games, 2, 8), dtype=np.int32)
+        self.health = np.zeros((games, 2, 8), dtype=np.int32)
+        self.active = np.zeros((games, 2, 8), dtype=bool)
+        self.occupied = np.zeros((games, 2, 8), dtype=bool)
+        self.player_health = np.zeros((games, 2), dtype=np.int32)
+
+    @property
+    def games(self) -> int:
+        """Число партий в пакете."""
+        return self.player_health.shape[0]
+
+    @classmethod
+    def from_engines(cls, engines: Sequence[GameEngine]) -> 'BatchBoard':
+        """Переносит состояние полей скалярных движков в массивы."""
+        board = cls(len(engines))
+        for game, engine in enumerate(engines):
+            for side, is_player in ((SIDE_OPPONENT, False), (SIDE_PLAYER, True)):
+                for slot, creature in enumerate(engine.field.get_creatures(is_player)):
+                    if creature is not None:
+                        board.attack[game, side, slot] = creature.attack
+                        board.health[game, side, slot] = creature.health
+                        board.active[game, side, slot] = creature.active
+                        board.occupied[game, side, slot] = True
+            board.player_health[game, SIDE_OPPONENT] = engine.opponent.health
+            board.player_health[game, SIDE_PLAYER] = engine.player.health
+        return board
+
+    def resolve_combat(self, is_player_turn: bool) -> None:
+        """Разрешает бой во всех партиях пакета: атаки, контратаки, урон и удаление убитых.
+
+        Слоты не влияют друг на друга, поэтому обход восьми слотов в
+        GameEngine.resolve_combat заменяется поэлементными операциями.
+        """
+        att = SIDE_PLAYER if is_player_turn else SIDE_OPPONENT
+        dfn = 1 - att
+
+        attacker_alive = self.occupied[:, att] & (self.health[:, att] > 0)
+        defender_alive = self.occupied[:, dfn] & (self.health[:, dfn] > 0)
+        attacks = attacker_alive & self.active[:, att]
+        fights = attacks & defender_alive
+        direct = attacks & ~defender_alive
+
+        attacker_attack = self.attack[:, att]
+        defender_attack = self.attack[:, dfn]
+        self.health[:, dfn] -= np.where(fights, attacker_attack, 0)
+        self.health[:, att] -= np.where(fights, defender_attack, 0)
+
+        # Урон суммируется до ограничения нулем: max(0, max(0, h - a) - b) == max(0, h - a - b)
+        damage = np.where(direct, attacker_attack, 0).sum(axis=1)
+        self.player_health[:, dfn] = np.maximum(0, self.player_health[:, dfn] - damage)
+
+        self.remove_dead()
+
+    def remove_dead(self) -> None:
+        """Удаляет с обеих сторон всех существ с неположительным здоровьем."""
+        dead = self.occupied & (self.health <= 0)
+        self.occupied &= ~dead
+        self.active &= ~dead
+        self.attack[dead] = 0
+        self.health[dead] = 0
+
+    def activate(self, is_player: bool) -> None:
+        """Активирует все существа стороны для атаки в следующем ходу."""
+        side = SIDE_PLAYER if is_player else SIDE_OPPONENT
+        self.active[:, side] |= self.occupied[:, side]
+
+    def is_game_over(self) -> np.ndarray:
+        """Возвращает маску партий, в которых здоровье одного из игроков упало до нуля."""
+        return (self.player_health <= 0).any(axis=1)
+
+    def equals(self, other: 'BatchBoard') -> bool:
+        """Проверяет, совпадают ли состояния двух пакетов."""
+        return all(np.array_equal(getattr(self, name), getattr(other, name))
+                   for name in ("attack", "health", "active", "occupied", "player_health"))
+
+
+def random_engines(games: int, seed: int = 0, max_turns: int = 12) -> List[GameEngine]:
+    """Создает безголовые движки в случайных позициях середины партии."""
+    from game.headless import HeadlessEvents
+    from game.policies import greedy_policy, random_policy
+
+    rng = random.Random(seed)
+    engines = []
+    for game in range(games):
+        engine = GameEngine(player_name="Игрок 1", events=HeadlessEvents(),
+                            rng=random.Random(rng.getrandbits(32)), ai_policy=random_policy)
+        engine.start_game()
+        for _ in range(rng.randint(0, max_turns)):
+            if engine.is_game_over():
+                break
+            move = greedy_policy(engine, True)
+            if move is not None:
+                engine.play_card(1, move[0], move[1], is_player=True)
+            engine.next_turn()
+        # Свежеразыгранное существо еще не активно и не должно атаковать
+        move = random_policy(engine, True)
+        if move is not None:
+            engine.play_card(1, move[0], move[1], is_player=True)
+        engines.append(engine)
+    return engines
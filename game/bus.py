@@ -0,0 +1,207 @@
+# game/bus.py
+"""Шина событий движка, текстовый журнал событий и счетчики времени по фазам хода.
+
+Движок публикует типизированные события через EventBus.emit(тип, *аргументы).
+Объект события создается, только если на этот тип кто-то подписан, поэтому
+без подписчиков публикация стоит одного поиска в словаре. Текст для журнала
+формирует LogSink в момент получения события.
+"""
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, Type, TypeVar
+
+from game.core import Creature
+
+E = TypeVar("E")
+T = TypeVar("T")
+
+
+@dataclass(slots=True)
+class CardPlayed:
+    """Карта разыграна в слот."""
+    player_name: str
+    creature: Creature
+    slot: int
+    is_player: bool
+
+
+@dataclass(slots=True)
+class PlayRejected:
+    """Розыгрыш карты отклонен: reason — "coords", "missing", "occupied" или "mana"."""
+    reason: str
+    player_name: str = ""
+    card_name: str = ""
+    slot: int = -1
+
+
+@dataclass(slots=True)
+class CreatureAttacked:
+    """Существо атаковало существо напротив."""
+    attacker: Creature
+    defender: Creature
+
+
+@dataclass(slots=True)
+class CreatureCounterattacked:
+    """Существо контратаковало атаковавшего."""
+    defender: Creature
+    attacker: Creature
+
+
+@dataclass(slots=True)
+class PlayerDamaged:
+    """Существо атаковало игрока напрямую."""
+    attacker: Creature
+    player_name: str
+    health: int
+
+
+@dataclass(slots=True)
+class CreatureRemoved:
+    """Убитое существо удалено с поля."""
+    name: str
+    slot: int
+    is_player: bool
+
+
+@dataclass(slots=True)
+class StateChanged:
+    """Состояние партии изменилось; cause — "play", "turn", "attack", "removal" или "activate"."""
+    engine: Any
+    cause: str
+
+
+@dataclass(slots=True)
+class SearchFinished:
+    """Поисковый AI выбрал ход."""
+    iterations: int
+    nodes_per_second: float
+
+
+@dataclass
+class PhaseTimer:
+    """Счетчики одной фазы хода: число вызовов, суммарное и максимальное время в секундах."""
+    calls: int = 0
+    total: float = 0.0
+    longest: float = 0.0
+
+    def add(self, elapsed: float) -> None:
+        self.calls += 1
+        self.total += elapsed
+        if elapsed > self.longest:
+            self.longest = elapsed
+
+
+class EventBus:
+    """Шина событий с подписчиками по типу события и таймерами фаз."""
+
+    def __init__(self) -> None:
+        self.handlers: Dict[type, List[Callable[[Any], None]]] = {}
+        self.phases: Dict[str, PhaseTimer] = defaultdict(PhaseTimer)
+
+    def subscribe(self, event_type: Type[E], handler: Callable[[E], None]) -> None:
+        """Подписывает обработчик на события указанного типа."""
+        self.handlers.setdefault(event_type, []).append(handler)
+
+    def unsubscribe(self, event_type: Type[E], handler: Callable[[E], None]) -> None:
+        """Отписывает обработчик; тип без подписчиков снова публикуется бесплатно."""
+        handlers = self.handlers.get(event_type, [])
+        if handler in handlers:
+            handlers.remove(handler)
+        if not handlers:
+            self.handlers.pop(event_type, None)
+
+    def emit(self, event_type: Type[E], *args: Any) -> None:
+        """Создает событие и передает его подписчикам, если они есть."""
+        handlers = self.handlers.get(event_type)
+        if handlers:
+            event = event_type(*args)
+            for handler in handlers:
+                handler(event)
+
+    def timed(self, phase: str, steps: Iterator[T]) -> Iterator[T]:
+        """Оборачивает шаговый генератор, засчитывая фазе только время работы внутри него.
+
+        Паузы между шагами (анимации в GUI) в замер не входят.
+        """
+        clock = time.perf_counter
+        elapsed = 0.0
+        while True:
+            start = clock()
+            try:
+                step = next(steps)
+            except StopIteration:
+                elapsed += clock() - start
+                break
+            elapsed += clock() - start
+            yield step
+        self.phases[phase].add(elapsed)
+
+    def profile(self) -> Dict[str, Dict[str, float]]:
+        """Возвращает счетчики фаз: число вызовов, суммарное, среднее и максимальное время в мс."""
+        return {
+            phase: {
+                "calls": timer.calls,
+                "total_ms": timer.total * 1000,
+                "mean_ms": timer.total * 1000 / timer.calls if timer.calls else 0.0,
+                "max_ms": timer.longest * 1000,
+            }
+            for phase, timer in self.phases.items()
+        }
+
+    def save_profile(self, path: str) -> None:
+        """Записывает счетчики фаз в JSON-файл."""
+        import json
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(self.profile(), file, ensure_ascii=False, indent=2)
+
+    def reset_profile(self) -> None:
+        """Обнуляет счетчики фаз."""
+        self.phases.clear()
+
+
+class LogSink:
+    """Текстовый журнал событий: форматирует событие только при его получении."""
+
+    FORMATTERS: Dict[type, Callable[[Any], str]] = {
+        CardPlayed: lambda e: f"{e.player_name} разыграл: {e.creature} в слот {e.slot}",
+        CreatureAttacked: lambda e: f"{e.attacker} атакует {e.defender}",
+        CreatureCounterattacked: lambda e: f"{e.defender} контратакует {e.attacker}",
+        PlayerDamaged: lambda e: f"{e.attacker} атакует {e.player_name}: HP {e.health}",
+        CreatureRemoved: lambda e: f"{e.name} удален с поля!",
+        SearchFinished: lambda e: f"MCTS: {e.iterations} итераций, {e.nodes_per_second:.0f} узлов/с",
+    }
+
+    REJECTIONS: Dict[str, str] = {
+        "coords": "Ошибка: Неверные координаты!",
+        "missing": "Ошибка: Карта отсутствует!",
+        "occupied": "Слот {slot} занят!",
+        "mana": "{player_name}: Недостаточно маны для карты {card_name}!",
+    }
+
+    def __init__(self, write: Callable[[str], None] = print) -> None:
+        """Аргументы:
+            write (Callable[[str], None]): Куда выводить строки журнала.
+        """
+        self.write = write
+
+    def attach(self, bus: EventBus) -> 'LogSink':
+        """Подписывает журнал на все события, которые он умеет форматировать."""
+        for event_type in self.FORMATTERS:
+            bus.subscribe(event_type, self.handle)
+        bus.subscribe(PlayRejected, self.handle)
+        return self
+
+    def detach(self, bus: EventBus) -> None:
+        """Отписывает журнал от шины."""
+        for event_type in (*self.FORMATTERS, PlayRejected):
+            bus.unsubscribe(event_type, self.handle)
+
+    def handle(self, event: Any) -> None:
+        """Форматирует событие и выводит строку."""
+        if isinstance(event, PlayRejected):
+            self.write(self.REJECTIONS[event.reason].format(player_name=event.player_name,
+                                                            card_name=event.card_name, slot=event.slot))
+        else:
+            self.write(self.FORMATTERS[type(event)](event))
@@ -1,21 +1,91 @@
 # game/core.py
+from bisect import bisect_right
 from dataclasses import dataclass
-from typing import List, Optional, Dict
+from random import Random
+from typing import ClassVar, List, Optional, Dict
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Card:
-    """Класс для представления карты в игре."""
+    """Неизменяемое описание карты, общее для сетки и всех разыгранных существ."""
     name: str           # Название карты
     mana_cost: int      # Стоимость маны для использования
     attack: int         # Атака существа
     health: int         # Здоровье существа
-    active: bool = False  # Активно ли существо для атаки (по умолчанию нет)
+    active: ClassVar[bool] = False  # Карта в сетке никогда не атакует
 
     def __str__(self) -> str:
         """Строковое представление карты для вывода"""
         return f"{self.name} (Мана: {self.mana_cost}, Атака: {self.attack}, HP: {self.health}, Активно: {self.active})"
 
 
+class CardCatalog:
+    """Реестр описаний карт: каждой уникальной карте выдается целочисленный id."""
+    def __init__(self) -> None:
+        self.cards: List[Card] = []
+        self.ids: Dict[Card, int] = {}
+
+    def intern(self, card: Card) -> int:
+        """Возвращает id карты, регистрируя ее при первом обращении."""
+        card_id = self.ids.get(card)
+        if card_id is None:
+            card_id = len(self.cards)
+            self.cards.append(card)
+            self.ids[card] = card_id
+        return card_id
+
+    def __getitem__(self, card_id: int) -> Card:
+        return self.cards[card_id]
+
+    def __len__(self) -> int:
+        return len(self.cards)
+
+
+CATALOG = CardCatalog()
+
+
+class Creature:
+    """Существо на поле: ссылка на описание карты, текущее здоровье и активность.
+
+    Название, стоимость и атака берутся из общего описания в CATALOG, поэтому
+    розыгрыш карты не копирует ее, а создает объект из трех полей.
+    """
+    __slots__ = ("card_id", "health", "active")
+
+    def __init__(self, card_id: int, health: int, active: bool = False) -> None:
+        self.card_id = card_id
+        self.health = health
+        self.active = active
+
+    @classmethod
+    def from_card(cls, card: Card) -> 'Creature':
+        """Создает неактивное существо с полным здоровьем из описания карты."""
+        return cls(CATALOG.intern(card), card.health)
+
+    @property
+    def card(self) -> Card:
+        """Описание карты существа."""
+        return CATALOG.cards[self.card_id]
+
+    @property
+    def name(self) -> str:
+        return CATALOG.cards[self.card_id].name
+
+    @property
+    def mana_cost(self) -> int:
+        return CATALOG.cards[self.card_id].mana_cost
+
+    @property
+    def attack(self) -> int:
+        return CATALOG.cards[self.card_id].attack
+
+    def __str__(self) -> str:
+        """Строковое представление существа для вывода"""
+        return f"{self.name} (Мана: {self.mana_cost}, Атака: {self.attack}, HP: {self.health}, Активно: {self.active})"
+
+    def __repr__(self) -> str:
+        return f"Creature(card_id={self.card_id}, health={self.health}, active={self.active})"
+
+
 @dataclass
 class Player:
     """Класс для представления игрока."""
@@ -40,32 +110,170 @@ class Player:
 @dataclass
 class Opponent(Player):
     """Класс для представления оппонента (AI). Наследуется от Player."""
-    def choose_card(self, grid: List[List[Optional[Card]]]) -> tuple[int, int]:
-        """Выбор карты AI из своей зоны сетки (верхняя строка 8x1)."""
-        from random import choice
-        available = [(0, col) for col in range(8) if grid[0][col] and self.can_play_card(grid[0][col])]
-        return choice(available) if available else (-1, -1)
+    def choose_card(self, field: 'GameField', rng: Optional[Random] = None) -> tuple[int, int]:
+        """Выбор карты AI из своей зоны сетки (верхняя строка 8x1).
+
+        Берутся колонки из допустимых ходов поля (GameField.legal_moves), поэтому карта
+        не выбирается, если ее некуда положить.
+
+        Аргументы:
+            field (GameField): Игровое поле.
+            rng (Random, optional): Генератор случайных чисел; по умолчанию — новый несвязанный генератор.
+
+        Возвращает:
+            tuple[int, int]: Строка и колонка карты в сетке или (-1, -1), если ходов нет.
+        """
+        moves = field.legal_moves(False, self.mana)
+        if not moves:
+            return -1, -1
+        rng = rng or Random()
+        # Каждая колонка встречается в ходах столько раз, сколько свободных слотов, поэтому выбор равновероятен
+        return 0, rng.choice(moves)[0]
+
+
+FULL_MASK = 0xFF  # Все 8 слотов стороны
+# Номера слотов, отмеченных в 8-битной маске, по возрастанию
+MASK_SLOTS: List[tuple[int, ...]] = [tuple(slot for slot in range(8) if mask >> slot & 1) for mask in range(256)]
+GRID_INDEX_LIMIT = 256  # Сколько индексов сеток хранит grid_index
+
+
+class GridIndex:
+    """Индекс карт сетки по стоимости и кэши доступных карт и ходов.
+
+    Зависит только от сетки, поэтому один индекс общий для всех полей с
+    одной и той же сеткой: копий движка в MCTS и замерах, движков,
+    восстановленных из одного снимка.
+    """
+    __slots__ = ("grid", "cost_index", "cost_keys", "affordable", "moves")
+
+    def __init__(self, grid: List[List[Optional[Card]]]) -> None:
+        self.grid = grid
+        # Для каждой строки: (стоимость, колонка) по возрастанию стоимости
+        self.cost_index = [sorted((card.mana_cost, col) for col, card in enumerate(row) if card is not None)
+                           for row in grid]
+        self.cost_keys = [[cost for cost, _ in index] for index in self.cost_index]
+        self.affordable: Dict[tuple[bool, int], tuple[int, ...]] = {}
+        self.moves: Dict[tuple[bool, int, int], tuple[tuple[int, int], ...]] = {}
+
+
+_grid_indexes: Dict[int, GridIndex] = {}
+
+
+def grid_index(grid: List[List[Optional[Card]]]) -> GridIndex:
+    """Индекс сетки, общий для всех полей с этим объектом сетки.
+
+    Индексы хранятся по id сетки вместе с самой сеткой, поэтому id не может
+    достаться другой сетке, пока индекс не вытеснен; хранится не больше
+    GRID_INDEX_LIMIT последних сеток.
+    """
+    index = _grid_indexes.get(id(grid))
+    if index is None or index.grid is not grid:
+        if len(_grid_indexes) >= GRID_INDEX_LIMIT:
+            del _grid_indexes[next(iter(_grid_indexes))]
+        index = GridIndex(grid)
+        _grid_indexes[id(grid)] = index
+    return index
 
 
 class GameField:
-    """Класс для представления игрового поля."""
+    """Класс для представления игрового поля.
+
+    Поле поддерживает маски занятых слотов каждой стороны и индекс карт
+    сетки по стоимости (GridIndex), поэтому список допустимых ходов строится
+    без перебора сетки и кэшируется по (сторона, мана, маска занятых слотов).
+    Слоты меняются только через place_creature/set_creature/remove_creature,
+    а сетка — присваиванием field.grid.
+
+    Маски dirty отмечают слоты, изменившиеся с последнего снимка состояния
+    (game/snapshot.py): размещение и удаление отмечаются здесь, изменения
+    здоровья и активности существ движок отмечает через touch().
+    """
     def __init__(self) -> None:
-        self.grid: List[List[Optional[Card]]] = [[None for _ in range(8)] for _ in range(2)]
-        self.player_creatures: List[Optional[Card]] = [None] * 8
-        self.opponent_creatures: List[Optional[Card]] = [None] * 8
+        self.player_creatures: List[Optional[Creature]] = [None] * 8
+        self.opponent_creatures: List[Optional[Creature]] = [None] * 8
+        self.occupied: List[int] = [0, 0]  # Маски занятых слотов: [оппонент, игрок]
+        self.dirty: List[int] = [0, 0]     # Маски слотов, изменившихся с последнего снимка
+        self.index = GridIndex([[None for _ in range(8)] for _ in range(2)])
+
+    @property
+    def grid(self) -> List[List[Optional[Card]]]:
+        """Сетка карт 8x2 (строка 0 — оппонент, строка 1 — игрок)."""
+        return self.index.grid
+
+    @grid.setter
+    def grid(self, grid: List[List[Optional[Card]]]) -> None:
+        self.index = grid_index(grid)
 
-    def place_creature(self, card: Card, slot: int, is_player: bool) -> bool:
+    def place_creature(self, creature: Creature, slot: int, is_player: bool) -> bool:
         """Размещает существо в указанный слот."""
         target = self.player_creatures if is_player else self.opponent_creatures
         if 0 <= slot < 8 and target[slot] is None:
-            target[slot] = card
+            target[slot] = creature
+            bit = 1 << slot
+            self.occupied[is_player] |= bit
+            self.dirty[is_player] |= bit
             return True
         return False
 
+    def set_creature(self, slot: int, is_player: bool, creature: Optional[Creature]) -> None:
+        """Записывает существо (или пустоту) в слот независимо от его текущего содержимого."""
+        target = self.player_creatures if is_player else self.opponent_creatures
+        target[slot] = creature
+        bit = 1 << slot
+        if creature is None:
+            self.occupied[is_player] &= ~bit
+        else:
+            self.occupied[is_player] |= bit
+        self.dirty[is_player] |= bit
+
+    def remove_creature(self, slot: int, is_player: bool) -> Optional[Creature]:
+        """Убирает существо из слота и возвращает его."""
+        target = self.player_creatures if is_player else self.opponent_creatures
+        creature = target[slot]
+        if creature is not None:
+            target[slot] = None
+            bit = 1 << slot
+            self.occupied[is_player] ^= bit
+            self.dirty[is_player] |= bit
+        return creature
+
+    def touch(self, slot: int, is_player: bool) -> None:
+        """Отмечает, что существо в слоте изменилось (здоровье или активность)."""
+        self.dirty[is_player] |= 1 << slot
+
+    def free_slots(self, is_player: bool) -> tuple[int, ...]:
+        """Свободные слоты стороны по возрастанию."""
+        return MASK_SLOTS[~self.occupied[is_player] & FULL_MASK]
+
+    def affordable(self, is_player: bool, mana: int) -> tuple[int, ...]:
+        """Колонки карт строки стороны со стоимостью не выше mana, по возрастанию колонки."""
+        index = self.index
+        key = (is_player, mana)
+        cols = index.affordable.get(key)
+        if cols is None:
+            row = 1 if is_player else 0
+            count = bisect_right(index.cost_keys[row], mana)
+            cols = tuple(sorted(col for _, col in index.cost_index[row][:count]))
+            index.affordable[key] = cols
+        return cols
+
+    def legal_moves(self, is_player: bool, mana: int) -> tuple[tuple[int, int], ...]:
+        """Допустимые ходы стороны: пары (колонка карты, свободный слот).
+
+        Результат кэшируется по (сторона, мана, маска занятых слотов).
+        """
+        key = (is_player, mana, self.occupied[is_player])
+        moves = self.index.moves.get(key)
+        if moves is None:
+            slots = self.free_slots(is_player)
+            moves = tuple((col, slot) for col in self.affordable(is_player, mana) for slot in slots)
+            self.index.moves[key] = moves
+        return moves
+
     def get_grid(self) -> List[List[Optional[Card]]]:
         """Возвращает текущую сетку карт."""
         return self.grid
 
-    def get_creatures(self, is_player: bool) -> List[Optional[Card]]:
+    def get_creatures(self, is_player: bool) -> List[Optional[Creature]]:
         """Возвращает список существ игрока или оппонента."""
         return self.player_creatures if is_player else self.opponent_creatures
\ No newline at end of file
@@ -1,21 +1,45 @@
 # game/engine.py
-from typing import Optional
-from game.core import Player, Opponent, Card, GameField
-from game.events import GameEvents
-from data.config import DELAY_BETWEEN_ACTIONS, DELAY_AI_ACTION
+from typing import List, Optional, TYPE_CHECKING
+from game.core import Card, Player, Opponent, Creature, GameField
+from game.bus import (EventBus, CardPlayed, PlayRejected, CreatureAttacked, CreatureCounterattacked,
+                      PlayerDamaged, CreatureRemoved, StateChanged)
+from game.policies import Policy, greedy_policy
+from game.timeline import Steps, TimedAction
+from data.config import DELAY_BETWEEN_ACTIONS, DELAY_BEFORE_REMOVE, DELAY_AI_ACTION
 
-import copy
 import random
+import time
+
+if TYPE_CHECKING:
+    from game.events import GameEvents
+    from game.gui import GUI
 
 class GameEngine:
     """Класс для управления логикой игры."""
-    def __init__(self, player_name: str) -> None:
+    def __init__(self, player_name: str, events: Optional['GameEvents'] = None,
+                 rng: Optional[random.Random] = None, ai_policy: Policy = greedy_policy) -> None:
+        """Инициализация движка.
+
+        Аргументы:
+            player_name (str): Имя игрока.
+            events (GameEvents, optional): Менеджер событий. По умолчанию —
+                GameEvents на pygame; для симуляций передается HeadlessEvents.
+            rng (random.Random, optional): Собственный генератор случайных чисел движка.
+            ai_policy (Policy): Стратегия, по которой ходит AI.
+        """
         self.player = Player(name=player_name)
         self.opponent = Opponent(name="AI")
         self.field = GameField()
         self.turn = 1
         self.opponent_turn = 0
-        self.events = GameEvents()
+        self.rng = rng or random.Random()
+        self.ai_policy = ai_policy
+        self.pending_removals: List[tuple[bool, int]] = []
+        self.bus = EventBus()  # События движка и счетчики времени по фазам
+        if events is None:
+            from game.events import GameEvents
+            events = GameEvents()
+        self.events = events
 
     def set_gui(self, gui: 'GUI') -> None:
         """Устанавливает GUI для событий.
@@ -25,87 +49,124 @@ class GameEngine:
         """
         self.events.set_gui(gui)
 
-    def start_game(self) -> None:
-        """Запускает игру, инициализируя поле."""
-        from data.cards import get_initial_grid
-        self.field.grid = get_initial_grid()
+    def start_game(self, grid: Optional[List[List[Card]]] = None) -> None:
+        """Запускает игру, инициализируя поле.
+
+        Аргументы:
+            grid (List[List[Card]], optional): Сетка карт (см. data/cards.make_grid);
+                по умолчанию — стартовая сетка get_initial_grid().
+        """
+        if grid is None:
+            from data.cards import get_initial_grid
+            grid = get_initial_grid()
+        self.field.grid = grid
         self.player.mana = min(self.turn, 10)
         self.opponent.mana = 0
 
     def next_turn(self) -> None:
         """Ход игрока: действия, атака активных, активация для следующего хода, передача хода AI."""
+        self.events.play(self.next_turn_steps())
+
+    def next_turn_steps(self) -> Steps:
+        """Пошаговый вариант next_turn: выдает действия с паузами перед их выполнением."""
+        yield from self.end_player_turn_steps()
+        yield from self.ai_turn_steps()
+
+    def end_player_turn_steps(self) -> Steps:
+        """Завершение хода игрока: прибавка маны, атака активных и их активация."""
+        return self.bus.timed("player_turn", self._end_player_turn())
+
+    def _end_player_turn(self) -> Steps:
         self.turn += 1
         self.player.mana = min(self.turn, 10)
-        self.resolve_combat(is_player_turn=True)
-        for creature in self.field.get_creatures(True):
-            if creature:
-                creature.active = True
-        self.events.delay(DELAY_BETWEEN_ACTIONS)
-        self.ai_turn()
+        self.record("turn")
+        yield from self.combat_steps(is_player_turn=True)
+        self.activate_creatures(True)
+        self.record("activate")
+        yield TimedAction("wait", DELAY_BETWEEN_ACTIONS)
 
-    def play_card(self, row: int, col: int, slot: int, is_player: bool) -> Optional[Card]:
+    def play_card(self, row: int, col: int, slot: int, is_player: bool) -> Optional[Creature]:
         """Разыгрывает карту из сетки в указанный слот."""
         if not (0 <= row < 2 and 0 <= col < 8 and 0 <= slot < 8):
-            print("Ошибка: Неверные координаты!")
+            self.bus.emit(PlayRejected, "coords")
             return None
 
         card = self.field.grid[row][col]
         if card is None:
-            print("Ошибка: Карта отсутствует!")
+            self.bus.emit(PlayRejected, "missing")
             return None
 
         player = self.player if is_player else self.opponent
         if player.can_play_card(card):
             player.spend_mana(card)
-            card_copy = copy.deepcopy(card)
-            card_copy.active = False
-            if self.field.place_creature(card_copy, slot, is_player):
-                print(f"{player.name} разыграл: {card_copy} в слот {slot}")
-                return card_copy
+            creature = Creature.from_card(card)
+            if self.field.place_creature(creature, slot, is_player):
+                self.bus.emit(CardPlayed, player.name, creature, slot, is_player)
+                self.record("play")
+                return creature
             else:
-                print(f"Слот {slot} занят!")
+                self.bus.emit(PlayRejected, "occupied", player.name, card.name, slot)
         else:
-            print(f"{player.name}: Недостаточно маны для карты {card.name}!")
+            self.bus.emit(PlayRejected, "mana", player.name, card.name, slot)
         return None
 
     def ai_turn(self) -> None:
         """Ход AI: действия, атака активных, активация для следующего хода."""
-        self.opponent_turn += 1
-        self.opponent.mana = min(self.opponent_turn, 10)
+        self.events.play(self.ai_turn_steps())
 
-        opponent_grid = self.field.grid[0]
-        player_creatures = self.field.get_creatures(True)
-        opponent_creatures = self.field.get_creatures(False)
+    def ai_turn_steps(self) -> Steps:
+        """Пошаговый вариант ai_turn: выдает действия с паузами перед их выполнением."""
+        return self.bus.timed("ai_turn", self._ai_turn())
 
-        for slot in range(8):
-            if opponent_creatures[slot] is None:
-                best_card_idx = -1
-                best_attack = -1
-                for col, card in enumerate(opponent_grid):
-                    if (self.opponent.can_play_card(card) and 
-                        card.attack > best_attack and 
-                        (player_creatures[slot] or random.random() > 0.3)):
-                        best_card_idx = col
-                        best_attack = card.attack
-                
-                if best_card_idx != -1:
-                    self.events.ai_action_delay()
-                    self.play_card(0, best_card_idx, slot, is_player=False)
-                    break
-
-        self.resolve_combat(is_player_turn=False)
-        for creature in self.field.get_creatures(False):
-            if creature:
+    def _ai_turn(self) -> Steps:
+        self.begin_ai_turn()
+
+        move = self.ai_policy(self, False)
+        if move is not None:
+            col, slot = move
+            yield TimedAction("play", DELAY_AI_ACTION, is_player=False, slot=slot)
+            self.play_card(0, col, slot, is_player=False)
+
+        yield from self.end_ai_turn_steps()
+
+    def begin_ai_turn(self) -> None:
+        """Начало хода AI: прибавка маны оппонента."""
+        self.opponent_turn += 1
+        self.opponent.mana = min(self.opponent_turn, 10)
+        self.record("turn")
+
+    def end_ai_turn_steps(self) -> Steps:
+        """Завершение хода AI: атака активных и их активация."""
+        yield from self.combat_steps(is_player_turn=False)
+        self.activate_creatures(False)
+        self.record("activate")
+        yield TimedAction("wait", DELAY_AI_ACTION)  # Задержка после хода AI
+
+    def activate_creatures(self, is_player: bool) -> None:
+        """Активирует существа стороны для атаки в следующем ходу."""
+        changed = 0
+        for slot, creature in enumerate(self.field.get_creatures(is_player)):
+            if creature and not creature.active:
                 creature.active = True
-        self.events.delay(DELAY_AI_ACTION)  # Задержка после хода AI
+                changed |= 1 << slot
+        if changed:
+            self.field.dirty[is_player] |= changed
 
     def resolve_combat(self, is_player_turn: bool) -> None:
         """Разрешает бои между существами и урон по HP с задержками."""
+        self.events.play(self.combat_steps(is_player_turn))
+
+    def combat_steps(self, is_player_turn: bool) -> Steps:
+        """Пошаговый вариант resolve_combat: атаки, контратаки и удаление убитых существ."""
+        return self.bus.timed("combat", self._combat(is_player_turn))
+
+    def _combat(self, is_player_turn: bool) -> Steps:
         player_creatures = self.field.get_creatures(True)
         opponent_creatures = self.field.get_creatures(False)
         attacking_creatures = player_creatures if is_player_turn else opponent_creatures
         defending_creatures = opponent_creatures if is_player_turn else player_creatures
         defender = self.opponent if is_player_turn else self.player
+        fought = 0  # Слоты, где здоровье изменилось с обеих сторон
 
         for slot in range(8):
             attacker = attacking_creatures[slot]
@@ -115,20 +176,48 @@ class GameEngine:
             defender_alive = defender_creature and defender_creature.health > 0
 
             if attacker_alive and attacker.active:
-                self.events.delay(DELAY_BETWEEN_ACTIONS)
+                yield TimedAction("attack", DELAY_BETWEEN_ACTIONS, is_player=is_player_turn, slot=slot)
                 if defender_alive:
                     defender_creature.health -= attacker.attack
-                    print(f"{attacker} атакует {defender_creature}")
+                    self.bus.emit(CreatureAttacked, attacker, defender_creature)
+                    yield TimedAction("counterattack", 0, is_player=not is_player_turn, slot=slot)
                     attacker.health -= defender_creature.attack
-                    print(f"{defender_creature} контратакует {attacker}")
+                    fought |= 1 << slot
+                    self.bus.emit(CreatureCounterattacked, defender_creature, attacker)
                 else:
                     defender.take_damage(attacker.attack)
-                    print(f"{attacker} атакует {defender.name}: HP {defender.health}")
-
-            self.events.mark_dead_creature(attacking_creatures, slot, is_player=is_player_turn)
-            self.events.mark_dead_creature(defending_creatures, slot, is_player=not is_player_turn)
-
-        self.events.resolve_pending_removals(player_creatures, opponent_creatures)
+                    self.bus.emit(PlayerDamaged, attacker, defender.name, defender.health)
+                self.record("attack")
+
+            self.mark_dead_creature(attacking_creatures, slot, is_player=is_player_turn)
+            self.mark_dead_creature(defending_creatures, slot, is_player=not is_player_turn)
+
+        if fought:
+            dirty = self.field.dirty
+            dirty[0] |= fought
+            dirty[1] |= fought
+        if self.pending_removals:
+            yield TimedAction("removal", DELAY_BEFORE_REMOVE)
+            start = time.perf_counter()
+            for is_player, slot in self.pending_removals:
+                target = player_creatures if is_player else opponent_creatures
+                if target[slot]:
+                    self.bus.emit(CreatureRemoved, target[slot].name, slot, is_player)
+                    self.field.remove_creature(slot, is_player)
+            self.pending_removals.clear()
+            self.record("removal")
+            self.bus.phases["removals"].add(time.perf_counter() - start)
+
+    def record(self, cause: str) -> None:
+        """Сообщает подписчикам (например, записи реплея), что состояние партии изменилось."""
+        self.bus.emit(StateChanged, self, cause)
+
+    def mark_dead_creature(self, creatures: List[Optional[Creature]], slot: int, is_player: bool) -> None:
+        """Помечает существо как убитое и добавляет его в список для удаления."""
+        if creatures[slot] and creatures[slot].health <= 0:
+            creatures[slot].active = False
+            self.field.dirty[is_player] |= 1 << slot
+            self.pending_removals.append((is_player, slot))
 
     def is_game_over(self) -> bool:
         """Проверяет, закончилась ли игра."""
@@ -1,54 +1,134 @@
 # game/gui.py (полный исправленный код)
-import pygame
-from typing import Optional
-from game.core import Card
+from functools import lru_cache
+from types import ModuleType
+from typing import Dict, List, Optional, Union
+from game.core import Card, Creature
 from game.engine import GameEngine
-from data.config import WHITE, BLACK, GRAY, GREEN, RED, YELLOW
+from game.snapshot import StateHistory
+from game.timeline import Timeline
+from data.config import WHITE, BLACK, GRAY, GREEN, RED, YELLOW, FPS, IDLE_FPS
 
-pygame.init()
+# pygame загружается и инициализируется при создании первого GUI (см. load_pygame),
+# чтобы импорт модулей игры не поднимал SDL и не сканировал системные шрифты
+pygame = None
 
 # Константы
 WIDTH, HEIGHT = 800, 600
 CARD_WIDTH, CARD_HEIGHT = 80, 100
 SLOT_SIZE = 80
-FONT = pygame.font.SysFont("Arial", 16)
+FONT_NAME, FONT_SIZE = "Arial", 16
+
+
+def load_pygame() -> ModuleType:
+    """Импортирует и инициализирует pygame при первом вызове."""
+    global pygame
+    if pygame is None:
+        import pygame as module
+        module.init()
+        pygame = module
+    return pygame
+
+
+@lru_cache(maxsize=None)
+def load_font(name: str = FONT_NAME, size: int = FONT_SIZE) -> 'pygame.font.Font':
+    """Возвращает системный шрифт; поиск шрифта выполняется один раз на процесс."""
+    return load_pygame().font.SysFont(name, size)
+
+STATUS_WIDTH = 600  # Ширина области строки статуса игрока
 
 class GUI:
-    """Класс для управления графическим интерфейсом."""
+    """Класс для управления графическим интерфейсом.
+
+    Поле перерисовывается по областям: для каждой карты и строки статуса
+    запоминается ключ видимого состояния, и на экран выводятся только
+    изменившиеся области через pygame.display.update(rects).
+    """
     def __init__(self, engine: GameEngine) -> None:
+        load_pygame()
         self.engine = engine
+        self.font = load_font()
         self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
         pygame.display.set_caption("Card Game")
         self.clock = pygame.time.Clock()
         self.running = True
+        self.text_cache: Dict[str, pygame.Surface] = {}    # Отрендеренные строки текста
+        self.card_cache: Dict[tuple, pygame.Surface] = {}  # Готовые поверхности карт по видимому состоянию
+        self.drawn: Dict[tuple[int, int], tuple] = {}      # Ключ состояния, нарисованный в каждой области
+        self.dirty_rects: List[pygame.Rect] = []
+        self.timeline = Timeline()
+
+    def render_text(self, text: str) -> 'pygame.Surface':
+        """Возвращает поверхность с текстом, рендеря каждую строку один раз."""
+        surface = self.text_cache.get(text)
+        if surface is None:
+            surface = self.font.render(text, True, BLACK)
+            self.text_cache[text] = surface
+        return surface
+
+    def card_surface(self, key: tuple) -> 'pygame.Surface':
+        """Возвращает поверхность карты для ключа (цвет, название, мана, атака, здоровье)."""
+        surface = self.card_cache.get(key)
+        if surface is None:
+            surface = pygame.Surface((CARD_WIDTH, CARD_HEIGHT))
+            surface.fill(key[0])
+            if len(key) > 1:
+                _, name, mana_cost, attack, health = key
+                surface.blit(self.render_text(name), (5, 5))
+                surface.blit(self.render_text(f"M:{mana_cost} A:{attack} H:{health}"), (5, 25))
+            self.card_cache[key] = surface
+        return surface
 
-    def draw_card(self, card: Optional[Card], x: int, y: int, clickable: bool = False) -> pygame.Rect:
-        """Рисует карту на экране с учетом состояния."""
+    def blit_region(self, rect: 'pygame.Rect', key: tuple, surface: 'pygame.Surface') -> None:
+        """Выводит поверхность в область, только если ее ключ изменился с прошлого кадра."""
+        if self.drawn.get(rect.topleft) != key:
+            self.screen.blit(surface, rect)
+            self.drawn[rect.topleft] = key
+            self.dirty_rects.append(rect)
+
+    def draw_card(self, card: Optional[Union[Card, Creature]], x: int, y: int, playable: bool = False) -> 'pygame.Rect':
+        """Рисует карту на экране с учетом состояния; playable — карту можно разыграть сейчас."""
         rect = pygame.Rect(x, y, CARD_WIDTH, CARD_HEIGHT)
         if card and card.health <= 0:
             color = RED
         elif card and card.active:
             color = YELLOW
-        elif clickable and card and self.engine.player.can_play_card(card):
+        elif playable and card:
             color = GREEN
         else:
             color = GRAY
-        pygame.draw.rect(self.screen, color, rect)
-        if card:
-            name_text = FONT.render(f"{card.name}", True, BLACK)
-            stats_text = FONT.render(f"M:{card.mana_cost} A:{card.attack} H:{card.health}", True, BLACK)
-            self.screen.blit(name_text, (x + 5, y + 5))
-            self.screen.blit(stats_text, (x + 5, y + 25))
+        key = (color, card.name, card.mana_cost, card.attack, card.health) if card else (color,)
+        self.blit_region(rect, key, self.card_surface(key))
         return rect
 
+    def draw_status(self, text: str, x: int, y: int) -> None:
+        """Рисует строку статуса игрока на белом фоне."""
+        rect = pygame.Rect(x, y, STATUS_WIDTH, self.font.get_linesize())
+        key = (text,)
+        if self.drawn.get(rect.topleft) != key:
+            surface = pygame.Surface(rect.size)
+            surface.fill(WHITE)
+            surface.blit(self.render_text(text), (0, 0))
+            self.blit_region(rect, key, surface)
+
+    def invalidate(self) -> None:
+        """Сбрасывает сведения о нарисованном, чтобы следующий кадр перерисовал все поле."""
+        self.drawn.clear()
+
     def draw_field(self) -> None:
-        """Рисует игровое поле: сетку, слоты и статистику."""
-        self.screen.fill(WHITE)
-        player_stats = FONT.render(f"{self.engine.player.name}: Mana {self.engine.player.mana}, HP {self.engine.player.health}", True, BLACK)
-        opp_stats = FONT.render(f"{self.engine.opponent.name}: Mana {self.engine.opponent.mana}, HP {self.engine.opponent.health}", True, BLACK)
-        self.screen.blit(player_stats, (10, HEIGHT - 40))
-        self.screen.blit(opp_stats, (10, 10))
+        """Рисует изменившиеся области игрового поля: сетку, слоты и статистику."""
+        if not self.drawn:
+            self.screen.fill(WHITE)
+            self.dirty_rects = [self.screen.get_rect()]
+            self.end_turn_btn = pygame.Rect(WIDTH - 150, HEIGHT - 50, 100, 30)
+            pygame.draw.rect(self.screen, GREEN, self.end_turn_btn)
+            self.screen.blit(self.render_text("Конец хода"), (WIDTH - 140, HEIGHT - 40))
+
+        player, opponent = self.engine.player, self.engine.opponent
+        self.draw_status(f"{player.name}: Mana {player.mana}, HP {player.health}", 10, HEIGHT - 40)
+        self.draw_status(f"{opponent.name}: Mana {opponent.mana}, HP {opponent.health}", 10, 10)
 
+        # Подсвечиваются только карты, для которых есть допустимый ход
+        playable_cols = {col for col, _ in self.engine.field.legal_moves(True, player.mana)}
         self.grid_rects = []
         for row in range(2):
             row_rects = []
@@ -56,8 +136,7 @@ class GUI:
                 card = self.engine.field.grid[row][col]
                 x = col * (CARD_WIDTH + 10) + 50
                 y = 50 if row == 0 else 420
-                clickable = (row == 1)
-                rect = self.draw_card(card, x, y, clickable)
+                rect = self.draw_card(card, x, y, row == 1 and col in playable_cols)
                 row_rects.append(rect)
             self.grid_rects.append(row_rects)
 
@@ -75,13 +154,23 @@ class GUI:
             rect = self.draw_card(card, x, 300)
             self.player_slots.append(rect)
 
-        self.end_turn_btn = pygame.Rect(WIDTH - 150, HEIGHT - 50, 100, 30)
-        pygame.draw.rect(self.screen, GREEN, self.end_turn_btn)
-        text = FONT.render("Конец хода", True, BLACK)
-        self.screen.blit(text, (WIDTH - 140, HEIGHT - 40))
+    def update_display(self) -> bool:
+        """Выводит на экран изменившиеся области.
+
+        Возвращает:
+            bool: True, если хотя бы одна область была обновлена.
+        """
+        if not self.dirty_rects:
+            return False
+        pygame.display.update(self.dirty_rects)
+        self.dirty_rects = []
+        return True
 
     def handle_click(self, pos: tuple[int, int]) -> None:
-        """Обрабатывает клики мыши."""
+        """Обрабатывает клики мыши. Пока воспроизводятся действия хода, клики игнорируются."""
+        if self.timeline.busy:
+            return
+
         for col, rect in enumerate(self.grid_rects[1]):
             if rect.collidepoint(pos):
                 self.selected_card = (1, col)
@@ -91,26 +180,47 @@ class GUI:
             for slot, rect in enumerate(self.player_slots):
                 if rect.collidepoint(pos):
                     row, col = self.selected_card
+                    if (col, slot) in self.engine.field.legal_moves(True, self.engine.player.mana):
+                        self.history.checkpoint()
                     self.engine.play_card(row, col, slot, is_player=True)
                     del self.selected_card
                     return
 
         if self.end_turn_btn.collidepoint(pos):
-            self.engine.next_turn()
+            self.history.checkpoint()
+            self.timeline.start(self.engine.next_turn_steps(), pygame.time.get_ticks())
 
     def run(self) -> None:
-        """Основной цикл игры с обновлением экрана после событий."""
+        """Основной цикл игры с обновлением экрана после событий.
+
+        Ход AI и бой воспроизводятся через Timeline, не блокируя цикл;
+        пробел переключает перемотку действий без пауз, Z и Y — отмена
+        и повтор розыгрышей и ходов.
+        """
         self.engine.start_game()
-        while self.running and not self.engine.is_game_over():
-            for event in pygame.event.get():
+        self.history = StateHistory(self.engine)
+        while self.running and (self.timeline.busy or not self.engine.is_game_over()):
+            events = pygame.event.get()
+            for event in events:
                 if event.type == pygame.QUIT:
                     self.running = False
                 elif event.type == pygame.MOUSEBUTTONDOWN:
                     self.handle_click(event.pos)
+                elif event.type == pygame.KEYDOWN and event.key == pygame.K_SPACE:
+                    self.timeline.fast_forward = not self.timeline.fast_forward
+                elif event.type == pygame.KEYDOWN and event.key in (pygame.K_z, pygame.K_y) and not self.timeline.busy:
+                    if event.key == pygame.K_z:
+                        self.history.undo()
+                    else:
+                        self.history.redo()
+                elif event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                    self.invalidate()
 
+            self.timeline.update(pygame.time.get_ticks())
             self.draw_field()
-            pygame.display.flip()
-            self.clock.tick(60)
+            changed = self.update_display()
+            # Без ввода, анимаций и изменений на экране цикл просыпается реже, почти не нагружая CPU
+            self.clock.tick(FPS if changed or events or self.timeline.busy else IDLE_FPS)
 
         if self.engine.player.health <= 0:
             print("Поражение: Игрок проиграл!")
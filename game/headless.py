@@ -0,0 +1,157 @@
+# game/headless.py
+"""Безголовый режим движка: симуляция партий без pygame и задержек."""
+import os
+import random
+from dataclasses import dataclass
+from multiprocessing import Pool
+from typing import Callable, Iterable, Iterator, List, Optional, Sequence, TYPE_CHECKING, TypeVar
+from data.card_db import default_database
+from game.bus import LogSink
+from game.core import Card
+from game.engine import GameEngine
+from game.policies import SEARCH_ITERATIONS, make_policy
+from game.timeline import Steps, run_instantly
+
+if TYPE_CHECKING:
+    from game.gui import GUI
+    from game.replay import ReplayWriter
+
+MAX_TURNS = 200  # Ограничение длины партии, после которого объявляется ничья
+
+Job = TypeVar("Job")
+Batch = TypeVar("Batch")
+
+
+class HeadlessEvents:
+    """Менеджер событий без отрисовки и задержек.
+
+    Повторяет интерфейс GameEvents, но не импортирует pygame: действия
+    движка выполняются сразу, без пауз и без ожидания GUI.
+    """
+
+    def __init__(self) -> None:
+        """Инициализация событийного менеджера."""
+        self.gui = None
+
+    def set_gui(self, gui: 'GUI') -> None:
+        """В безголовом режиме GUI не используется."""
+        self.gui = gui
+
+    def delay(self, milliseconds: int) -> None:
+        """Задержки в безголовом режиме не выполняются."""
+
+    def play(self, steps: Steps) -> None:
+        """Выполняет действия движка без пауз."""
+        run_instantly(steps)
+
+
+@dataclass
+class GameResult:
+    """Итог одной симулированной партии."""
+    seed: int
+    winner: Optional[str]   # "player", "opponent" или None при ничьей
+    turns: int
+    player_health: int
+    opponent_health: int
+
+
+def winner_of(engine: GameEngine) -> Optional[str]:
+    """Победитель партии: "player", "opponent" или None, если победителя нет."""
+    if engine.opponent.health <= 0 < engine.player.health:
+        return "player"
+    if engine.player.health <= 0 < engine.opponent.health:
+        return "opponent"
+    return None
+
+
+def simulate_game(seed: int, player_policy: str = "greedy", opponent_policy: str = "greedy",
+                  max_turns: int = MAX_TURNS, verbose: bool = False,
+                  replay: Optional['ReplayWriter'] = None, observers: Sequence = (),
+                  grid: Optional[List[List[Card]]] = None) -> GameResult:
+    """Играет полную партию AI против AI без pygame и задержек.
+
+    Все случайные решения берутся из собственного генератора движка,
+    поэтому одно и то же зерно всегда дает одну и ту же партию.
+
+    Аргументы:
+        seed (int): Зерно генератора случайных чисел.
+        player_policy (str): Имя стратегии игрока (нижняя строка).
+        opponent_policy (str): Имя стратегии оппонента (верхняя строка).
+        max_turns (int): Максимальное число ходов до объявления ничьей.
+        verbose (bool): Печатать ли сообщения о событиях игры.
+        replay (ReplayWriter, optional): Запись реплея партии.
+        observers (Sequence): Наблюдатели с методом attach(engine), подключаемые после начала партии
+            (например, GameTracker из game/analytics.py).
+        grid (List[List[Card]], optional): Сетка карт партии; по умолчанию — стартовая.
+
+    Возвращает:
+        GameResult: Итог партии.
+    """
+    # Поиск ограничен числом итераций, а не временем, чтобы партия зависела только от зерна
+    choose_move = make_policy(player_policy, SEARCH_ITERATIONS)
+    engine = GameEngine(player_name="Игрок 1", events=HeadlessEvents(),
+                        rng=random.Random(seed), ai_policy=make_policy(opponent_policy, SEARCH_ITERATIONS))
+    if verbose:
+        LogSink().attach(engine.bus)
+    engine.start_game(grid)
+    if replay is not None:
+        replay.attach(engine)
+    for observer in observers:
+        observer.attach(engine)
+
+    while not engine.is_game_over() and engine.turn <= max_turns:
+        move = choose_move(engine, True)
+        if move is not None:
+            col, slot = move
+            engine.play_card(1, col, slot, is_player=True)
+        engine.next_turn()
+
+    return GameResult(seed=seed, winner=winner_of(engine), turns=engine.turn,
+                      player_health=engine.player.health,
+                      opponent_health=engine.opponent.health)
+
+
+def play_seeded_match(seed: int, a: str, b: str, grid: Optional[List[List[Card]]] = None,
+                      observers: Sequence = ()) -> tuple[int, GameResult]:
+    """Играет партию стратегий a и b, распределяя стороны по четности зерна.
+
+    При четном зерне a играет за игрока (нижняя строка), при нечетном — за
+    оппонента. Сетка grid задается для случая, когда a — игрок: при нечетном
+    зерне ее строки меняются местами, и a получает те же карты.
+
+    Аргументы:
+        seed (int): Зерно партии.
+        a (str): Имя стратегии, с точки зрения которой считается итог.
+        b (str): Имя стратегии противника.
+        grid (List[List[Card]], optional): Сетка карт; по умолчанию — стартовая.
+        observers (Sequence): Наблюдатели, передаваемые в simulate_game.
+
+    Возвращает:
+        tuple[int, GameResult]: Итог для a (1 — победа, -1 — поражение, 0 — ничья) и итог партии.
+    """
+    a_is_player = seed % 2 == 0
+    if a_is_player:
+        result = simulate_game(seed, player_policy=a, opponent_policy=b, observers=observers, grid=grid)
+    else:
+        swapped = None if grid is None else [grid[1], grid[0]]
+        result = simulate_game(seed, player_policy=b, opponent_policy=a, observers=observers, grid=swapped)
+
+    if result.winner is None:
+        return 0, result
+    return (1 if (result.winner == "player") == a_is_player else -1), result
+
+
+def run_batches(play: Callable[[Job], Batch], jobs: Iterable[Job], workers: int = 0) -> Iterator[Batch]:
+    """Выполняет задания и отдает их результаты по мере готовности (порядок не сохраняется).
+
+    Аргументы:
+        play (Callable): Функция уровня модуля, играющая одно задание.
+        jobs (Iterable): Задания.
+        workers (int): Число процессов; 0 — по числу ядер, 1 — без пула.
+    """
+    if workers == 1:
+        yield from map(play, jobs)
+        return
+    default_database()  # Кэш базы карт собирается до запуска процессов, а не в каждом из них
+    with Pool(processes=workers or os.cpu_count()) as pool:
+        yield from pool.imap_unordered(play, jobs)
@@ -0,0 +1,410 @@
+# game/optimizer.py
+"""Эволюционный подбор колод с кэшем результатов матчей на диске.
+
+Колода — 8 id карт базы data/cards.csv. Кандидаты играют безголовые
+партии против фиксированного пула соперников. Результат матча (пара колод
+на блоке зерен) хранится в MatchupCache под каноническим хешем: колода
+упорядочивается по характеристикам карт, пара — по характеристикам колод,
+а в ключ входят характеристики карт (не id), зерна блока, стратегия и
+лимит ходов. Поэтому выжившие колоды и уже встречавшиеся пары повторно не
+симулируются, а правка характеристик карты в cards.csv делает старые
+записи недостижимыми; они вытесняются как давно не использованные.
+
+Колода оценивается раундами: в каждом раунде играется следующий блок
+зерен против каждого соперника пула. После раунда строится доверительный
+интервал Уилсона для доли очков (ничья — пол-очка), и оценка
+прекращается, как только интервал целиком выше или ниже порога отбора —
+доли очков худшей из лучших колод прошлого поколения.
+
+Запуск:
+    python -m game.optimizer --generations 20 --population 16 --seeds 256
+"""
+import hashlib
+import math
+import os
+import random
+import sqlite3
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Sequence
+
+from data.card_db import DATA_DIR, CardDatabase, default_database
+from data.cards import OPPONENT_DECK, PLAYER_DECK, make_grid
+from game.headless import MAX_TURNS, play_seeded_match
+
+Deck = tuple[int, ...]  # Id карт базы в каноническом порядке
+
+CACHE_VERSION = 1   # Меняется при изменении правил, влияющих на исход партий
+DEFAULT_CACHE = os.path.join(DATA_DIR, "matchups.sqlite")
+COMMIT_EVERY = 1000  # Изменений кэша между фиксациями транзакции
+MAX_FILL_ATTEMPTS = 20  # Попыток на колоду найти новую колоду при заполнении поколения
+
+
+@dataclass
+class Score:
+    """Итог матча с точки зрения одной колоды."""
+    wins: int = 0
+    losses: int = 0
+    draws: int = 0
+
+    @property
+    def games(self) -> int:
+        return self.wins + self.losses + self.draws
+
+    @property
+    def rate(self) -> float:
+        """Доля очков: победа — 1, ничья — 0.5."""
+        return (self.wins + 0.5 * self.draws) / self.games if self.games else 0.5
+
+    def add(self, other: 'Score') -> None:
+        self.wins += other.wins
+        self.losses += other.losses
+        self.draws += other.draws
+
+    def flipped(self) -> 'Score':
+        """Тот же матч с точки зрения соперника."""
+        return Score(self.losses, self.wins, self.draws)
+
+    def interval(self, z: float = 1.96) -> tuple[float, float]:
+        """Доверительный интервал Уилсона для доли очков."""
+        n = self.games
+        if n == 0:
+            return 0.0, 1.0
+        p = self.rate
+        center = (p + z * z / (2 * n)) / (1 + z * z / n)
+        margin = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / (1 + z * z / n)
+        return center - margin, center + margin
+
+
+def canonical_deck(database: CardDatabase, card_ids: Sequence[int]) -> Deck:
+    """Колода в каноническом порядке: по стоимости, атаке, здоровью и id.
+
+    Канонический порядок — это и порядок колонок в сетке при игре, поэтому
+    колоды с одинаковым набором карт играют одинаково.
+    """
+    return tuple(sorted(card_ids, key=lambda card_id: (*database.stats(card_id), card_id)))
+
+
+def matchup_key(database: CardDatabase, deck: Deck, opponent: Deck, seeds: Sequence[int],
+                policy: str) -> tuple[bytes, bool]:
+    """Канонический ключ матча двух колод на наборе зерен.
+
+    Возвращает:
+        tuple[bytes, bool]: Ключ и признак того, что в канонической паре колода deck вторая
+            (тогда результат из кэша нужно перевернуть).
+    """
+    deck_stats = tuple(database.stats(card_id) for card_id in deck)
+    opponent_stats = tuple(database.stats(card_id) for card_id in opponent)
+    flipped = opponent_stats < deck_stats
+    first, second = (opponent_stats, deck_stats) if flipped else (deck_stats, opponent_stats)
+    payload = repr((CACHE_VERSION, MAX_TURNS, policy, first, second, tuple(seeds))).encode("utf-8")
+    return hashlib.blake2b(payload, digest_size=16).digest(), flipped
+
+
+def play_block(database: CardDatabase, first: Deck, second: Deck, seeds: Sequence[int], policy: str) -> Score:
+    """Играет матч двух колод на зернах seeds; итог — с точки зрения first.
+
+    Стороны распределяет play_seeded_match: при четном зерне first играет за игрока (нижняя строка).
+    """
+    first_cards = [database.card(card_id) for card_id in first]
+    second_cards = [database.card(card_id) for card_id in second]
+    grid = make_grid(second_cards, first_cards)
+    score = Score()
+    for seed in seeds:
+        outcome, _ = play_seeded_match(seed, policy, policy, grid=grid)
+        if outcome == 0:
+            score.draws += 1
+        elif outcome == 1:
+            score.wins += 1
+        else:
+            score.losses += 1
+    return score
+
+
+class MatchupCache:
+    """Результаты матчей в SQLite с вытеснением давно не использованных записей.
+
+    Аргументы:
+        path (str): Путь к файлу кэша.
+        max_entries (int): Предельное число записей; при превышении удаляется десятая часть
+            записей, которые дольше всего не читались и не записывались.
+    """
+
+    def __init__(self, path: str = DEFAULT_CACHE, max_entries: int = 500_000) -> None:
+        self.max_entries = max_entries
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS matchups (key BLOB PRIMARY KEY, wins INTEGER NOT NULL, "
+            "losses INTEGER NOT NULL, draws INTEGER NOT NULL, used INTEGER NOT NULL) WITHOUT ROWID")
+        self.connection.execute("CREATE INDEX IF NOT EXISTS matchups_used ON matchups (used)")
+        self.clock, self.size = self.connection.execute(
+            "SELECT COALESCE(MAX(used), 0), COUNT(*) FROM matchups").fetchone()
+        self.changes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: bytes) -> Optional[Score]:
+        """Результат матча по ключу или None, если матч еще не игрался."""
+        row = self.connection.execute("SELECT wins, losses, draws FROM matchups WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.clock += 1
+        self.connection.execute("UPDATE matchups SET used = ? WHERE key = ?", (self.clock, key))
+        self.changed()
+        return Score(*row)
+
+    def put(self, key: bytes, score: Score) -> None:
+        """Сохраняет результат матча."""
+        self.clock += 1
+        cursor = self.connection.execute(
+            "INSERT OR IGNORE INTO matchups (key, wins, losses, draws, used) VALUES (?, ?, ?, ?, ?)",
+            (key, score.wins, score.losses, score.draws, self.clock))
+        self.size += cursor.rowcount
+        if self.size > self.max_entries:
+            self.evict(self.size - self.max_entries * 9 // 10)
+        self.changed()
+
+    def evict(self, count: int) -> None:
+        """Удаляет count записей, которые дольше всего не использовались."""
+        self.connection.execute(
+            "DELETE FROM matchups WHERE key IN (SELECT key FROM matchups ORDER BY used LIMIT ?)", (count,))
+        self.size = self.connection.execute("SELECT COUNT(*) FROM matchups").fetchone()[0]
+
+    def changed(self) -> None:
+        self.changes += 1
+        if self.changes >= COMMIT_EVERY:
+            self.connection.commit()
+            self.changes = 0
+
+    def close(self) -> None:
+        """Фиксирует изменения и закрывает файл кэша."""
+        self.connection.commit()
+        self.connection.close()
+
+    def __enter__(self) -> 'MatchupCache':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+@dataclass
+class Evaluation:
+    """Оценка колоды против пула соперников."""
+    deck: Deck
+    score: Score
+    decided: bool   # Оценка остановлена досрочно: интервал целиком по одну сторону порога
+
+
+def check_matches(seeds: int, block_size: int) -> None:
+    """Проверяет параметры матчей.
+
+    Исключения:
+        ValueError: Если в матче нет зерен или блок меньше одного зерна.
+    """
+    if seeds < 1:
+        raise ValueError(f"Матч должен содержать хотя бы одно зерно: {seeds}")
+    if block_size < 1:
+        raise ValueError(f"Блок должен содержать хотя бы одно зерно: {block_size}")
+
+
+class DeckEvaluator:
+    """Оценка колод против пула соперников с кэшем матчей и досрочной остановкой.
+
+    Аргументы:
+        database (CardDatabase): База карт.
+        pool (Sequence[Deck]): Колоды соперников.
+        seeds (Sequence[int]): Зерна партий каждого матча.
+        cache (MatchupCache): Кэш результатов матчей.
+        block_size (int): Зерен в одном блоке — единице кэширования и шаге досрочной остановки.
+        policy (str): Стратегия обеих сторон.
+        z (float): Квантиль нормального распределения для доверительного интервала.
+
+    Исключения:
+        ValueError: Если параметры не проходят check_matches.
+    """
+
+    def __init__(self, database: CardDatabase, pool: Sequence[Deck], seeds: Sequence[int], cache: MatchupCache,
+                 block_size: int = 16, policy: str = "greedy", z: float = 1.96) -> None:
+        check_matches(len(seeds), block_size)
+        self.database = database
+        self.pool = list(pool)
+        self.blocks = [tuple(seeds[start:start + block_size]) for start in range(0, len(seeds), block_size)]
+        self.cache = cache
+        self.policy = policy
+        self.z = z
+        self.simulated = 0  # Сыграно партий (без взятых из кэша)
+
+    def matchup(self, deck: Deck, opponent: Deck, block: Sequence[int]) -> Score:
+        """Итог матча на блоке зерен с точки зрения deck; из кэша, если он уже игрался."""
+        key, flipped = matchup_key(self.database, deck, opponent, block, self.policy)
+        score = self.cache.get(key)
+        if score is None:
+            first, second = (opponent, deck) if flipped else (deck, opponent)
+            score = play_block(self.database, first, second, block, self.policy)
+            self.simulated += len(block)
+            self.cache.put(key, score)
+        return score.flipped() if flipped else score
+
+    def evaluate(self, deck: Deck, threshold: Optional[float] = None) -> Evaluation:
+        """Оценивает колоду раундами по блокам зерен.
+
+        Аргументы:
+            deck (Deck): Колода в каноническом порядке.
+            threshold (float, optional): Порог доли очков для досрочной остановки; None — играть все блоки.
+        """
+        total = Score()
+        for block in self.blocks:
+            for opponent in self.pool:
+                total.add(self.matchup(deck, opponent, block))
+            if threshold is not None:
+                low, high = total.interval(self.z)
+                if low > threshold or high < threshold:
+                    return Evaluation(deck, total, decided=True)
+        return Evaluation(deck, total, decided=False)
+
+
+def mutate(database: CardDatabase, rng: random.Random, deck: Deck, max_cost: Optional[int] = None) -> Deck:
+    """Заменяет одну случайную карту колоды случайной картой базы."""
+    cards = list(deck)
+    cards[rng.randrange(len(cards))] = database.random_ids(rng, 1, max_cost)[0]
+    return canonical_deck(database, cards)
+
+
+def crossover(database: CardDatabase, rng: random.Random, first: Deck, second: Deck) -> Deck:
+    """Случайные 8 карт из объединения двух колод."""
+    return canonical_deck(database, rng.sample(first + second, len(first)))
+
+
+def check_evolution(population_size: int, elite: int) -> None:
+    """Проверяет параметры эволюции.
+
+    Исключения:
+        ValueError: Если популяция меньше 2 колод или число лучших не от 1 до размера популяции.
+    """
+    if population_size < 2:
+        raise ValueError(f"Популяция должна содержать хотя бы 2 колоды: {population_size}")
+    if not 1 <= elite <= population_size:
+        raise ValueError(f"Число лучших колод должно быть от 1 до {population_size}: {elite}")
+
+
+def evolve(evaluator: DeckEvaluator, rng: random.Random, initial: Sequence[Deck], population_size: int = 16,
+           generations: int = 10, elite: int = 4, max_cost: Optional[int] = None,
+           report: Optional[Callable[[int, List[Evaluation]], None]] = None) -> List[Evaluation]:
+    """Эволюция колод: оценка, отбор лучших, мутации и скрещивание.
+
+    Аргументы:
+        evaluator (DeckEvaluator): Оценка колод.
+        rng (random.Random): Генератор случайных чисел.
+        initial (Sequence[Deck]): Начальные колоды; популяция дополняется случайными.
+        population_size (int): Размер популяции.
+        generations (int): Число поколений.
+        elite (int): Число лучших колод, переходящих в следующее поколение без изменений.
+        max_cost (int, optional): Максимальная стоимость карты в новых колодах.
+        report (Callable, optional): Вызывается после оценки каждого поколения.
+
+    Возвращает:
+        List[Evaluation]: Оценки последнего поколения, от лучшей к худшей.
+
+    Исключения:
+        ValueError: Если параметры не проходят check_evolution.
+    """
+    check_evolution(population_size, elite)
+    database = evaluator.database
+    population = list(dict.fromkeys(initial))[:population_size]
+    while len(population) < population_size:
+        population.append(canonical_deck(database, database.random_ids(rng, 8, max_cost)))
+
+    threshold = None
+    evaluations: List[Evaluation] = []
+    for generation in range(generations):
+        evaluations = [evaluator.evaluate(deck, threshold) for deck in population]
+        evaluations.sort(key=lambda evaluation: evaluation.score.rate, reverse=True)
+        if report is not None:
+            report(generation, evaluations)
+        parents = evaluations[:elite]
+        threshold = parents[-1].score.rate
+
+        population = [evaluation.deck for evaluation in parents]
+        seen = set(population)
+        # В маленьком пуле карт различных колод может быть меньше размера популяции:
+        # после MAX_FILL_ATTEMPTS попыток на колоду повторы допускаются
+        attempts = MAX_FILL_ATTEMPTS * population_size
+        while len(population) < population_size:
+            if len(parents) > 1 and rng.random() < 0.5:
+                first, second = rng.sample(parents, 2)
+                child = crossover(database, rng, first.deck, second.deck)
+            else:
+                child = mutate(database, rng, rng.choice(parents).deck, max_cost)
+            attempts -= 1
+            if child not in seen or attempts < 0:
+                seen.add(child)
+                population.append(child)
+    return evaluations
+
+
+def default_pool(database: CardDatabase, rng: random.Random, random_decks: int = 4,
+                 max_cost: Optional[int] = None) -> List[Deck]:
+    """Пул соперников: обе стартовые колоды и несколько случайных."""
+    pool = [canonical_deck(database, OPPONENT_DECK), canonical_deck(database, PLAYER_DECK)]
+    for _ in range(random_decks):
+        pool.append(canonical_deck(database, database.random_ids(rng, 8, max_cost)))
+    return pool
+
+
+def main() -> None:
+    """Разбирает аргументы командной строки, подбирает колоды и печатает лучшую."""
+    import argparse
+    import time
+
+    from game.policies import POLICIES
+
+    parser = argparse.ArgumentParser(description="Эволюционный подбор колод.")
+    parser.add_argument("--generations", type=int, default=10, help="Число поколений")
+    parser.add_argument("--population", type=int, default=16, help="Размер популяции")
+    parser.add_argument("--elite", type=int, default=4, help="Лучших колод, переходящих в следующее поколение")
+    parser.add_argument("--seeds", type=int, default=128, help="Зерен партий в каждом матче")
+    parser.add_argument("--block-size", type=int, default=16, help="Зерен в блоке кэша")
+    parser.add_argument("--pool-random", type=int, default=4, help="Случайных колод в пуле соперников")
+    parser.add_argument("--max-cost", type=int, help="Максимальная стоимость карты")
+    parser.add_argument("--policy", choices=sorted(POLICIES), default="greedy", help="Стратегия обеих сторон")
+    parser.add_argument("--cache", default=DEFAULT_CACHE, help="Файл кэша матчей")
+    parser.add_argument("--cache-size", type=int, default=500_000, help="Предельное число записей кэша")
+    parser.add_argument("--seed", type=int, default=0, help="Зерно эволюции")
+    args = parser.parse_args()
+    try:
+        check_evolution(args.population, args.elite)
+        check_matches(args.seeds, args.block_size)
+    except ValueError as error:
+        parser.error(str(error))
+
+    database = default_database()
+    rng = random.Random(args.seed)
+    pool = default_pool(database, random.Random(args.seed), args.pool_random, args.max_cost)
+    start = time.perf_counter()
+
+    with MatchupCache(args.cache, args.cache_size) as cache:
+        evaluator = DeckEvaluator(database, pool, range(args.seeds), cache,
+                                  block_size=args.block_size, policy=args.policy)
+
+        def report(generation: int, evaluations: List[Evaluation]) -> None:
+            best = evaluations[0]
+            decided = sum(1 for evaluation in evaluations if evaluation.decided)
+            print(f"Поколение {generation}: лучшая {best.score.rate:.1%} за {best.score.games} партий, "
+                  f"досрочно {decided}/{len(evaluations)}, сыграно {evaluator.simulated}, "
+                  f"кэш {cache.hits}/{cache.hits + cache.misses}")
+
+        evaluations = evolve(evaluator, rng, pool[:2], args.population, args.generations,
+                             args.elite, args.max_cost, report)
+
+    best = evaluations[0]
+    print(f"Лучшая колода ({best.score.rate:.1%}, {best.score.games} партий) за {time.perf_counter() - start:.1f} с:")
+    for card_id in best.deck:
+        card = database.card(card_id)
+        print(f"  {card_id:5} {card.name:24} мана {card.mana_cost}, атака {card.attack}, HP {card.health}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+# game/policies.py
+"""Стратегии AI: выбор карты и слота для одной стороны поля."""
+from typing import Callable, Dict, Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from game.engine import GameEngine
+
+Move = tuple[int, int]  # (колонка карты в сетке, слот на поле)
+Policy = Callable[['GameEngine', bool], Optional[Move]]
+
+SEARCH_BUDGET_MS = 50     # Время поиска на ход в интерактивной игре
+SEARCH_ITERATIONS = 256   # Итераций поиска на ход там, где партия должна воспроизводиться по зерну
+
+
+def greedy_policy(engine: 'GameEngine', is_player: bool) -> Optional[Move]:
+    """Жадный выбор: в первый свободный слот — самая сильная доступная карта.
+
+    Пустой слот напротив пустого слота противника занимается лишь с
+    вероятностью 70%, как в исходном GameEngine.ai_turn.
+    """
+    field = engine.field
+    own_grid = field.grid[1 if is_player else 0]
+    own = engine.player if is_player else engine.opponent
+    enemy_creatures = field.get_creatures(not is_player)
+    # Доступные карты перебираются в порядке колонок, как в полном переборе сетки,
+    # поэтому генератор случайных чисел вызывается столько же раз
+    affordable = field.affordable(is_player, own.mana)
+    if not affordable:
+        return None
+
+    for slot in field.free_slots(is_player):
+        best_card_idx = -1
+        best_attack = -1
+        for col in affordable:
+            card = own_grid[col]
+            if (card.attack > best_attack and
+                    (enemy_creatures[slot] or engine.rng.random() > 0.3)):
+                best_card_idx = col
+                best_attack = card.attack
+
+        if best_card_idx != -1:
+            return best_card_idx, slot
+    return None
+
+
+def random_policy(engine: 'GameEngine', is_player: bool) -> Optional[Move]:
+    """Случайная доступная карта в случайный свободный слот."""
+    own = engine.player if is_player else engine.opponent
+    available = engine.field.affordable(is_player, own.mana)
+    free_slots = engine.field.free_slots(is_player)
+    if not available or not free_slots:
+        return None
+    return engine.rng.choice(available), engine.rng.choice(free_slots)
+
+
+def _mcts_policy(iterations: Optional[int] = None) -> Policy:
+    """Создает поисковую стратегию: с бюджетом времени на ход или с фиксированным числом итераций."""
+    from game.search import MCTSPolicy
+    if iterations is None:
+        return MCTSPolicy(budget_ms=SEARCH_BUDGET_MS)
+    return MCTSPolicy(budget_ms=None, iterations=iterations)
+
+
+# Фабрики стратегий: стратегии с состоянием (например, таблицей транспозиций) создаются заново.
+# Аргумент фабрики — число итераций поиска на ход; стратегии без поиска его не используют
+POLICIES: Dict[str, Callable[[Optional[int]], Policy]] = {
+    "greedy": lambda iterations=None: greedy_policy,
+    "random": lambda iterations=None: random_policy,
+    "mcts": _mcts_policy,
+}
+
+
+def make_policy(name: str, iterations: Optional[int] = None) -> Policy:
+    """Возвращает стратегию по имени.
+
+    Аргументы:
+        name (str): Имя стратегии из POLICIES.
+        iterations (int, optional): Фиксированное число итераций поиска на ход, при котором
+            ход зависит только от состояния и зерна (турниры, симуляции); по умолчанию поиск
+            ограничен временем SEARCH_BUDGET_MS, как нужно для интерактивной игры.
+
+    Исключения:
+        ValueError: Если стратегия с таким именем не зарегистрирована.
+    """
+    try:
+        factory = POLICIES[name]
+    except KeyError:
+        raise ValueError(f"Неизвестная стратегия: {name}") from None
+    return factory(iterations)
@@ -0,0 +1,271 @@
+# game/replay.py
+"""Компактный двоичный формат реплеев.
+
+Реплей состоит из двух файлов:
+    <путь>      — поток записей фиксированного размера (RECORD) с изменениями состояния;
+    <путь>.key  — ключевые кадры фиксированного размера (KEYFRAME) с полным состоянием.
+
+Запись создается при каждом изменении состояния движка (розыгрыш карты,
+начало хода, атака, удаление, активация) и содержит только изменившиеся
+слоты, игроков и счетчики ходов. Ключевой кадр пишется в начале партии и в
+начале каждого хода, кратного interval, поэтому переход к любому ходу —
+это чтение ближайшего кадра по его номеру и применение не более interval
+ходов записей.
+
+Файл ключевых кадров начинается с заголовка (HEADER): сигнатура, версия,
+интервал кадров и id 16 карт стартовой сетки. Все id карт в реплее — id
+строк базы карт (data/card_db.py), а не id в CATALOG, которые зависят от
+порядка регистрации карт в процессе, поэтому реплей читается в любом процессе
+и для любой сетки, а не только для стартовой.
+"""
+import mmap
+import os
+import struct
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple
+
+from data.card_db import CardDatabase, default_database
+from game.bus import StateChanged
+from game.core import CATALOG, Card, Creature
+from game.engine import GameEngine
+
+MAGIC = b"RPLY"
+VERSION = 2
+# Сигнатура, версия, интервал ключевых кадров, id карт сетки (8 оппонента, затем 8 игрока)
+HEADER = struct.Struct("<4sHH16i")
+
+# Тип записи, причина изменения, сторона, слот, три поля значений
+RECORD = struct.Struct("<BBBBhhh")
+# Ход, ход оппонента, номер записи, HP и мана игроков, id карт, здоровье и активность 16 слотов
+KEYFRAME = struct.Struct("<HHI4h16h16h16B")
+
+KIND_SLOT = 0     # side, slot, a=id карты (-1 — пусто), b=здоровье, c=активность
+KIND_PLAYER = 1   # side, a=здоровье, b=мана
+KIND_TURN = 2     # a=ход, b=ход оппонента
+
+CAUSES = ["start", "play", "turn", "attack", "removal", "activate"]
+CAUSE_CODES = {cause: code for code, cause in enumerate(CAUSES)}
+
+SIDE_OPPONENT = 0
+SIDE_PLAYER = 1
+
+State = Tuple[tuple, tuple, tuple]  # (счетчики ходов, игроки, слоты)
+
+
+def capture_state(engine: GameEngine) -> State:
+    """Снимает состояние партии в виде кортежей, пригодных для сравнения."""
+    turns = (engine.turn, engine.opponent_turn)
+    players = ((engine.opponent.health, engine.opponent.mana), (engine.player.health, engine.player.mana))
+    slots = []
+    for is_player in (False, True):
+        for creature in engine.field.get_creatures(is_player):
+            if creature is None:
+                slots.append((-1, 0, 0))
+            else:
+                slots.append((creature.card_id, creature.health, int(creature.active)))
+    return turns, players, tuple(slots)
+
+
+class ReplayWriter:
+    """Потоковая запись реплея во время игры.
+
+    Подключается к шине событий движка через attach() и получает изменения по событию StateChanged.
+    """
+
+    def __init__(self, path: str, interval: int = 10, database: Optional[CardDatabase] = None) -> None:
+        """Открывает файлы реплея на запись.
+
+        Аргументы:
+            path (str): Путь к файлу записей; ключевые кадры пишутся в path + ".key".
+            interval (int): Через сколько ходов записывается ключевой кадр.
+            database (CardDatabase, optional): База, из которой взяты карты сетки;
+                по умолчанию — база игры.
+        """
+        self.interval = interval
+        self.database = database or default_database()
+        self.records: BinaryIO = open(path, "wb")
+        self.keyframes: BinaryIO = open(path + ".key", "wb")
+        self.stable_ids: Dict[int, int] = {-1: -1}  # id в CATALOG -> id строки базы
+        self.count = 0
+        self.state: Optional[State] = None
+
+    def attach(self, engine: GameEngine) -> None:
+        """Подключает запись к движку, пишет заголовок с сеткой и начальный ключевой кадр.
+
+        Исключения:
+            KeyError: Если карты сетки нет в базе.
+        """
+        grid_ids = []
+        for card in engine.field.grid[0] + engine.field.grid[1]:
+            grid_ids.append(self.database.card_id(card))
+            self.stable_ids[CATALOG.intern(card)] = grid_ids[-1]
+        self.keyframes.write(HEADER.pack(MAGIC, VERSION, self.interval, *grid_ids))
+        engine.bus.subscribe(StateChanged, self.on_state_changed)
+        self.state = self.stable_state(engine)
+        self.write_keyframe(self.state)
+
+    def stable_state(self, engine: GameEngine) -> State:
+        """Состояние партии (см. capture_state) с id строк базы вместо id в CATALOG."""
+        turns, players, slots = capture_state(engine)
+        stable_ids = self.stable_ids
+        return turns, players, tuple((stable_ids[slot[0]], slot[1], slot[2]) for slot in slots)
+
+    def on_state_changed(self, event: StateChanged) -> None:
+        """Обработчик события шины: записывает изменения состояния."""
+        self.capture(event.engine, event.cause)
+
+    def capture(self, engine: GameEngine, cause: str) -> None:
+        """Пишет записи для всего, что изменилось с прошлого вызова."""
+        state = self.stable_state(engine)
+        turns, players, slots = state
+        old_turns, old_players, old_slots = self.state
+        code = CAUSE_CODES[cause]
+        pack = RECORD.pack
+        out = []
+        for index, slot_state in enumerate(slots):
+            if slot_state != old_slots[index]:
+                out.append(pack(KIND_SLOT, code, index // 8, index % 8, *slot_state))
+        for side, player_state in enumerate(players):
+            if player_state != old_players[side]:
+                out.append(pack(KIND_PLAYER, code, side, 0, player_state[0], player_state[1], 0))
+        if turns != old_turns:
+            # Запись хода идет последней, чтобы при переходе к ходу применились все изменения его начала
+            out.append(pack(KIND_TURN, code, 0, 0, turns[0], turns[1], 0))
+        if out:
+            self.records.write(b"".join(out))
+            self.count += len(out)
+        self.state = state
+        if turns[0] != old_turns[0] and turns[0] % self.interval == 0:
+            self.write_keyframe(state)
+
+    def write_keyframe(self, state: State) -> None:
+        """Пишет ключевой кадр с полным состоянием и номером следующей записи."""
+        turns, players, slots = state
+        self.keyframes.write(KEYFRAME.pack(
+            turns[0], turns[1], self.count,
+            players[0][0], players[0][1], players[1][0], players[1][1],
+            *(slot[0] for slot in slots), *(slot[1] for slot in slots), *(slot[2] for slot in slots)))
+
+    def close(self) -> None:
+        """Дописывает буферы и закрывает файлы."""
+        self.records.close()
+        self.keyframes.close()
+
+    def __enter__(self) -> 'ReplayWriter':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class ReplayReader:
+    """Чтение реплея через отображение файлов в память."""
+
+    def __init__(self, path: str, database: Optional[CardDatabase] = None) -> None:
+        """Открывает файлы реплея.
+
+        Аргументы:
+            path (str): Путь к файлу записей, переданный ReplayWriter.
+            database (CardDatabase, optional): База, с которой записан реплей; по умолчанию — база игры.
+
+        Исключения:
+            ValueError: Если файл не является реплеем этой версии.
+        """
+        self.files: List[BinaryIO] = [open(path, "rb"), open(path + ".key", "rb")]
+        self.records = self._map(self.files[0])
+        self.keyframes = self._map(self.files[1])
+        if len(self.keyframes) < HEADER.size:
+            self.close()
+            raise ValueError(f"Неверный формат реплея: {path}")
+        magic, version, self.interval, *grid_ids = HEADER.unpack_from(self.keyframes, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"Неверный формат реплея: {path}")
+        self.keyframe_count = (len(self.keyframes) - HEADER.size) // KEYFRAME.size
+
+        database = database or default_database()
+        self.grid: List[List[Card]] = [[database.card(card_id) for card_id in grid_ids[:8]],
+                                       [database.card(card_id) for card_id in grid_ids[8:]]]
+        # id строки базы -> id в CATALOG этого процесса
+        self.catalog_ids: Dict[int, int] = {card_id: CATALOG.intern(database.card(card_id)) for card_id in grid_ids}
+
+    @staticmethod
+    def _map(file: BinaryIO) -> bytes:
+        """Отображает файл в память; пустой файл читается как пустая строка."""
+        if os.fstat(file.fileno()).st_size == 0:
+            return b""
+        return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def __len__(self) -> int:
+        """Число записей в реплее."""
+        return len(self.records) // RECORD.size
+
+    def record(self, index: int) -> tuple:
+        """Возвращает запись по номеру: (тип, причина, сторона, слот, a, b, c)."""
+        return RECORD.unpack_from(self.records, index * RECORD.size)
+
+    def iter_records(self, start: int = 0) -> Iterator[tuple]:
+        """Перебирает записи начиная с номера start."""
+        return RECORD.iter_unpack(memoryview(self.records)[start * RECORD.size:])
+
+    def keyframe(self, index: int) -> tuple:
+        """Возвращает поля ключевого кадра по номеру."""
+        return KEYFRAME.unpack_from(self.keyframes, HEADER.size + index * KEYFRAME.size)
+
+    def state_at(self, turn: int) -> GameEngine:
+        """Восстанавливает безголовый движок в состоянии начала хода turn.
+
+        Берется ключевой кадр с номером turn // interval (кадр 0 — начало партии),
+        затем применяются записи до записи начала нужного хода включительно.
+        Если партия закончилась раньше, возвращается ее конечное состояние.
+        """
+        from game.headless import HeadlessEvents
+
+        index = max(0, min(turn // self.interval, self.keyframe_count - 1))
+        frame = self.keyframe(index)
+        engine = GameEngine(player_name="Игрок 1", events=HeadlessEvents())
+        engine.start_game(grid=self.grid)
+        self.apply_keyframe(engine, frame)
+        if engine.turn == turn:
+            return engine
+
+        for kind, _, side, slot, a, b, c in self.iter_records(frame[2]):
+            self.apply_record(engine, kind, side, slot, a, b, c)
+            if kind == KIND_TURN and a >= turn:
+                break
+        return engine
+
+    def apply_keyframe(self, engine: GameEngine, frame: tuple) -> None:
+        """Переносит полное состояние из ключевого кадра в движок."""
+        engine.turn, engine.opponent_turn = frame[0], frame[1]
+        engine.opponent.health, engine.opponent.mana, engine.player.health, engine.player.mana = frame[3:7]
+        card_ids, healths, actives = frame[7:23], frame[23:39], frame[39:55]
+        for index in range(16):
+            creature = None
+            if card_ids[index] >= 0:
+                creature = Creature(self.catalog_ids[card_ids[index]], healths[index], bool(actives[index]))
+            engine.field.set_creature(index % 8, index // 8 == SIDE_PLAYER, creature)
+
+    def apply_record(self, engine: GameEngine, kind: int, side: int, slot: int, a: int, b: int, c: int) -> None:
+        """Применяет одну запись к состоянию движка."""
+        if kind == KIND_SLOT:
+            creature = None if a < 0 else Creature(self.catalog_ids[a], b, bool(c))
+            engine.field.set_creature(slot, side == SIDE_PLAYER, creature)
+        elif kind == KIND_PLAYER:
+            player = engine.player if side == SIDE_PLAYER else engine.opponent
+            player.health, player.mana = a, b
+        elif kind == KIND_TURN:
+            engine.turn, engine.opponent_turn = a, b
+
+    def close(self) -> None:
+        """Закрывает отображения и файлы."""
+        for mapped in (self.records, self.keyframes):
+            if isinstance(mapped, mmap.mmap):
+                mapped.close()
+        for file in self.files:
+            file.close()
+
+    def __enter__(self) -> 'ReplayReader':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,290 @@
+# game/search.py
+"""Поисковый AI: Монте-Карло поиск по дереву (UCT) с таблицей транспозиций.
+
+Решения принимаются в начале хода стороны: разыграть одну из доступных
+карт в свободный слот или пропустить розыгрыш. Ход противника моделируется
+жадной стратегией, поэтому узлы дерева — только точки решения своей стороны.
+Узлы хранятся в таблице транспозиций по хешу Зобриста с вытеснением
+давно не использованных (LRU), а время на ход ограничено бюджетом.
+Итерации играются в одном рабочем движке, который перед каждой итерацией
+возвращается к снимку корня (game/snapshot.py): переписываются только
+слоты, измененные прошлой итерацией.
+"""
+import math
+import random
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from game.bus import SearchFinished
+from game.core import GridIndex
+from game.engine import GameEngine
+from game.headless import HeadlessEvents
+from game.policies import Move, greedy_policy
+from game.snapshot import GameSnapshot, restore, spawn, take_snapshot
+from game.timeline import run_instantly
+
+
+def clone_engine(engine: GameEngine, rng: random.Random) -> GameEngine:
+    """Создает безголовую копию состояния партии.
+
+    Сетка карт общая: описания карт неизменяемы, копируются только игроки и существа.
+    """
+    return spawn(take_snapshot(engine), rng, engine.player.name)
+
+
+def legal_moves(engine: GameEngine, is_player: bool) -> List[Optional[Move]]:
+    """Все ходы стороны: доступная карта в свободный слот, а также пропуск (None)."""
+    own = engine.player if is_player else engine.opponent
+    moves: List[Optional[Move]] = list(engine.field.legal_moves(is_player, own.mana))
+    moves.append(None)
+    return moves
+
+
+def advance(engine: GameEngine, is_player: bool, move: Optional[Move]) -> None:
+    """Применяет ход стороны и доигрывает до ее следующей точки решения.
+
+    Ответ противника выбирается жадной стратегией с генератором движка.
+    """
+    if is_player:
+        if move is not None:
+            engine.play_card(1, move[0], move[1], is_player=True)
+        run_instantly(engine.end_player_turn_steps())
+        engine.begin_ai_turn()
+        reply = greedy_policy(engine, False)
+        if reply is not None:
+            engine.play_card(0, reply[0], reply[1], is_player=False)
+        run_instantly(engine.end_ai_turn_steps())
+    else:
+        if move is not None:
+            engine.play_card(0, move[0], move[1], is_player=False)
+        run_instantly(engine.end_ai_turn_steps())
+        reply = greedy_policy(engine, True)
+        if reply is not None:
+            engine.play_card(1, reply[0], reply[1], is_player=True)
+        run_instantly(engine.end_player_turn_steps())
+        engine.begin_ai_turn()
+
+
+def evaluate(engine: GameEngine, is_player: bool) -> float:
+    """Оценка позиции для стороны в диапазоне [0, 1]: 1 — победа, 0 — поражение."""
+    own = engine.player if is_player else engine.opponent
+    enemy = engine.opponent if is_player else engine.player
+    if own.health <= 0 or enemy.health <= 0:
+        if own.health > 0:
+            return 1.0
+        if enemy.health > 0:
+            return 0.0
+        return 0.5
+    board = 0
+    for creature in engine.field.get_creatures(is_player):
+        if creature:
+            board += creature.attack + creature.health
+    for creature in engine.field.get_creatures(not is_player):
+        if creature:
+            board -= creature.attack + creature.health
+    score = own.health - enemy.health + 0.5 * board
+    return 1.0 / (1.0 + math.exp(-score / 10.0))
+
+
+class ZobristHasher:
+    """Хеш Зобриста состояния партии: XOR случайных ключей всех его составляющих.
+
+    Ключи создаются лениво для каждой встреченной комбинации значений и
+    не зависят от процесса: генератор инициализируется фиксированным зерном.
+    В хеш входит и сетка карт: существа с одинаковыми id на разных сетках —
+    разные позиции, а таблица транспозиций переживает смену партии.
+    """
+
+    def __init__(self, seed: int = 0x5EED) -> None:
+        self.rng = random.Random(seed)
+        self.keys: Dict[tuple, int] = {}
+        self.grid_index: Optional[GridIndex] = None  # Индекс сетки, для которой посчитан grid_key
+        self.grid_key = 0
+
+    def key(self, feature: tuple) -> int:
+        """Возвращает случайный 64-битный ключ признака состояния."""
+        value = self.keys.get(feature)
+        if value is None:
+            value = self.rng.getrandbits(64)
+            self.keys[feature] = value
+        return value
+
+    def hash(self, engine: GameEngine, is_player: bool) -> int:
+        """Хеш состояния в точке решения стороны is_player."""
+        key = self.key
+        index = engine.field.index
+        if index is not self.grid_index:
+            self.grid_index = index
+            self.grid_key = key(("grid", tuple(card for row in index.grid for card in row)))
+        h = key(("side", is_player)) ^ self.grid_key
+        h ^= key(("player", engine.player.health, engine.player.mana))
+        h ^= key(("opponent", engine.opponent.health, engine.opponent.mana))
+        for side in (True, False):
+            for slot, creature in enumerate(engine.field.get_creatures(side)):
+                if creature is not None:
+                    h ^= key((side, slot, creature.card_id, creature.health, creature.active))
+        return h
+
+
+class SearchNode:
+    """Узел таблицы транспозиций: статистика ходов в одной точке решения."""
+    __slots__ = ("visits", "moves", "move_visits", "move_values")
+
+    def __init__(self, moves: List[Optional[Move]]) -> None:
+        self.visits = 0
+        self.moves = moves
+        self.move_visits = [0] * len(moves)
+        self.move_values = [0.0] * len(moves)
+
+    def select(self, exploration: float) -> int:
+        """Индекс хода по UCB1; непосещенные ходы выбираются первыми."""
+        best_index = 0
+        best_score = -1.0
+        log_visits = math.log(self.visits + 1)
+        for index, visits in enumerate(self.move_visits):
+            if visits == 0:
+                return index
+            score = self.move_values[index] / visits + exploration * math.sqrt(log_visits / visits)
+            if score > best_score:
+                best_index = index
+                best_score = score
+        return best_index
+
+
+class TranspositionTable:
+    """Таблица транспозиций ограниченного размера с вытеснением LRU."""
+
+    def __init__(self, max_size: int) -> None:
+        self.max_size = max_size
+        self.nodes: OrderedDict[int, SearchNode] = OrderedDict()
+
+    def get(self, key: int) -> Optional[SearchNode]:
+        node = self.nodes.get(key)
+        if node is not None:
+            self.nodes.move_to_end(key)
+        return node
+
+    def put(self, key: int, node: SearchNode) -> None:
+        self.nodes[key] = node
+        if len(self.nodes) > self.max_size:
+            self.nodes.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+
+@dataclass
+class SearchStats:
+    """Статистика последнего поиска."""
+    iterations: int
+    nodes: int           # Число смоделированных точек решения
+    elapsed: float       # Время поиска в секундах
+    table_size: int
+
+    @property
+    def nodes_per_second(self) -> float:
+        return self.nodes / self.elapsed if self.elapsed > 0 else 0.0
+
+
+class MCTSPolicy:
+    """Стратегия AI на основе UCT с таблицей транспозиций и бюджетом времени на ход.
+
+    Аргументы:
+        budget_ms (int, optional): Время на ход в миллисекундах; None — без ограничения.
+        iterations (int, optional): Максимальное число итераций; None — без ограничения.
+        max_depth (int): Глубина дерева в точках решения своей стороны.
+        rollout_turns (int): Длина жадного доигрывания за листом дерева.
+        exploration (float): Коэффициент исследования UCB1.
+        table_size (int): Максимальное число узлов в таблице транспозиций.
+    """
+
+    def __init__(self, budget_ms: Optional[int] = 200, iterations: Optional[int] = None,
+                 max_depth: int = 4, rollout_turns: int = 4, exploration: float = 1.4,
+                 table_size: int = 100_000) -> None:
+        if budget_ms is None and iterations is None:
+            raise ValueError("Нужно задать бюджет времени или число итераций")
+        self.budget_ms = budget_ms
+        self.iterations = iterations
+        self.max_depth = max_depth
+        self.rollout_turns = rollout_turns
+        self.exploration = exploration
+        self.table = TranspositionTable(table_size)
+        self.hasher = ZobristHasher()
+        self.last_stats: Optional[SearchStats] = None
+        self.sim: Optional[GameEngine] = None
+
+    def __call__(self, engine: GameEngine, is_player: bool) -> Optional[Move]:
+        """Выбирает ход стороны поиском из текущего состояния партии."""
+        # Зерно поиска берется из генератора движка, чтобы партия оставалась воспроизводимой
+        rng = random.Random(engine.rng.getrandbits(64))
+        root_key = self.hasher.hash(engine, is_player)
+        root = self.table.get(root_key)
+        if root is None:
+            root = SearchNode(legal_moves(engine, is_player))
+            self.table.put(root_key, root)
+        if len(root.moves) == 1:
+            return root.moves[0]
+
+        start = time.perf_counter()
+        deadline = start + self.budget_ms / 1000 if self.budget_ms is not None else math.inf
+        iterations = 0
+        nodes = 0
+        if self.sim is None:
+            self.sim = GameEngine(engine.player.name, events=HeadlessEvents(), ai_policy=greedy_policy)
+        root_state = take_snapshot(engine)
+        restore(self.sim, root_state)
+        while (self.iterations is None or iterations < self.iterations) and time.perf_counter() < deadline:
+            nodes += self.simulate(root_state, is_player, root_key, rng)
+            iterations += 1
+
+        elapsed = time.perf_counter() - start
+        self.last_stats = SearchStats(iterations, nodes, elapsed, len(self.table))
+        engine.bus.emit(SearchFinished, iterations, self.last_stats.nodes_per_second)
+
+        root = self.table.get(root_key) or root
+        best = max(range(len(root.moves)), key=root.move_visits.__getitem__)
+        return root.moves[best]
+
+    def simulate(self, root_state: GameSnapshot, is_player: bool, root_key: int, rng: random.Random) -> int:
+        """Одна итерация: спуск по дереву, расширение, доигрывание и обновление статистики.
+
+        Рабочий движок self.sim к началу итерации находится в состоянии root_state
+        и возвращается в него в конце.
+
+        Возвращает:
+            int: Число смоделированных точек решения.
+        """
+        sim = self.sim
+        sim.rng.seed(rng.getrandbits(64))
+        path: List[tuple[SearchNode, int]] = []
+        key = root_key
+        nodes = 0
+        for depth in range(self.max_depth):
+            node = self.table.get(key)
+            expanded = node is None
+            if expanded:
+                node = SearchNode(legal_moves(sim, is_player))
+                self.table.put(key, node)
+            index = node.select(self.exploration)
+            path.append((node, index))
+            advance(sim, is_player, node.moves[index])
+            nodes += 1
+            if expanded or sim.is_game_over():
+                break
+            key = self.hasher.hash(sim, is_player)
+
+        for _ in range(self.rollout_turns):
+            if sim.is_game_over():
+                break
+            advance(sim, is_player, greedy_policy(sim, is_player))
+            nodes += 1
+
+        value = evaluate(sim, is_player)
+        restore(sim, root_state, root_state)
+        for node, index in path:
+            node.visits += 1
+            node.move_visits[index] += 1
+            node.move_values[index] += value
+        return nodes
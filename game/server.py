@@ -0,0 +1,239 @@
+# game/server.py
+"""Асинхронный сервер партий: много изолированных безголовых сессий в одном процессе.
+
+Протокол строковый (UTF-8): одна команда на строку, на каждую команду —
+одна строка ответа "ok ..." или "err <причина>".
+    new [seed] [ai]          -> ok <sid> <стоимости 8 карт игрока>
+    play <sid> <col> <slot>  -> ok <состояние>
+    end <sid>                -> ok <состояние>   (конец хода игрока и ход AI)
+    state <sid>              -> ok <состояние>
+    close <sid>              -> ok
+    stats                    -> ok <открытых сессий> <завершенных партий>
+
+Состояние: <ход> <HP игрока> <мана игрока> <HP AI> <мана AI> <итог> <слоты игрока> <слоты AI>.
+Итог — "-" (партия идет), "player", "opponent" или "draw"; слоты перечисляются
+через запятую как "id/здоровье/активность", пустой слот — ".".
+
+Сессии принадлежат соединению и закрываются вместе с ним. Команды одного
+соединения выполняются по очереди, поэтому движок сессии никогда не
+используется из двух потоков сразу. Ход AI выполняется в пуле потоков, чтобы
+поиск (mcts) не останавливал цикл событий; при workers=0 он выполняется прямо
+в цикле, что быстрее для дешевых стратегий.
+
+Запуск:
+    python -m game.server --port 8765 --workers 4
+    python -m game.server --unix /tmp/game.sock
+"""
+import asyncio
+import itertools
+import random
+from concurrent.futures import ThreadPoolExecutor
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from game.bus import PlayRejected
+from game.core import Creature
+from game.engine import GameEngine
+from game.headless import MAX_TURNS, HeadlessEvents, winner_of
+from game.policies import make_policy
+from game.timeline import run_instantly
+
+Sessions = Dict[int, GameEngine]
+
+
+class CommandError(Exception):
+    """Ошибка команды протокола; текст исключения — причина для ответа "err"."""
+
+
+def is_finished(engine: GameEngine) -> bool:
+    """Закончена ли партия: погиб один из игроков или превышен лимит ходов."""
+    return engine.is_game_over() or engine.turn > MAX_TURNS
+
+
+def format_slots(creatures: List[Optional[Creature]]) -> str:
+    """Слоты стороны в формате протокола."""
+    return ",".join("." if creature is None else f"{creature.card_id}/{creature.health}/{int(creature.active)}"
+                    for creature in creatures)
+
+
+def format_state(engine: GameEngine) -> str:
+    """Состояние партии в формате протокола."""
+    result = "-"
+    if is_finished(engine):
+        result = winner_of(engine) or "draw"
+    player, opponent = engine.player, engine.opponent
+    return (f"{engine.turn} {player.health} {player.mana} {opponent.health} {opponent.mana} {result} "
+            f"{format_slots(engine.field.get_creatures(True))} {format_slots(engine.field.get_creatures(False))}")
+
+
+def parse_ints(args: List[str], count: int) -> List[int]:
+    """Разбирает ровно count целых аргументов команды."""
+    if len(args) != count:
+        raise CommandError("syntax")
+    try:
+        return [int(arg) for arg in args]
+    except ValueError:
+        raise CommandError("syntax") from None
+
+
+class GameServer:
+    """Сервер партий поверх asyncio.
+
+    Аргументы:
+        workers (int): Потоков для ходов AI; 0 — ходы AI выполняются в цикле событий.
+        max_sessions (int): Предельное число одновременно открытых сессий.
+    """
+
+    def __init__(self, workers: int = 4, max_sessions: int = 100_000) -> None:
+        self.executor = ThreadPoolExecutor(max_workers=workers) if workers > 0 else None
+        self.max_sessions = max_sessions
+        self.session_ids = itertools.count(1)
+        self.open_sessions = 0
+        self.finished_matches = 0
+        self.commands: Dict[str, Callable[[Sessions, List[str]], Awaitable[str]]] = {
+            "new": self.cmd_new,
+            "play": self.cmd_play,
+            "end": self.cmd_end,
+            "state": self.cmd_state,
+            "close": self.cmd_close,
+            "stats": self.cmd_stats,
+        }
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Обслуживает одно соединение до его закрытия."""
+        sessions: Sessions = {}
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                reply = await self.execute(sessions, line.decode("utf-8", "replace").split())
+                writer.write(reply.encode("utf-8") + b"\n")
+                await writer.drain()
+        except (ConnectionError, asyncio.LimitOverrunError, ValueError):
+            pass
+        finally:
+            self.open_sessions -= len(sessions)
+            writer.close()
+
+    async def execute(self, sessions: Sessions, words: List[str]) -> str:
+        """Выполняет одну команду и возвращает строку ответа."""
+        if not words:
+            return "err syntax"
+        command = self.commands.get(words[0])
+        if command is None:
+            return "err unknown"
+        try:
+            return await command(sessions, words[1:])
+        except CommandError as error:
+            return f"err {error}"
+
+    @staticmethod
+    def session(sessions: Sessions, word: str) -> GameEngine:
+        """Движок сессии по ее номеру из команды."""
+        try:
+            return sessions[int(word)]
+        except (KeyError, ValueError):
+            raise CommandError("session") from None
+
+    async def cmd_new(self, sessions: Sessions, args: List[str]) -> str:
+        if len(args) > 2:
+            raise CommandError("syntax")
+        if self.open_sessions >= self.max_sessions:
+            raise CommandError("limit")
+        seed = parse_ints(args[:1], 1)[0] if args else None
+        try:
+            policy = make_policy(args[1] if len(args) > 1 else "greedy")
+        except ValueError:
+            raise CommandError("policy") from None
+
+        engine = GameEngine(player_name="Игрок 1", events=HeadlessEvents(),
+                            rng=random.Random(seed), ai_policy=policy)
+        engine.start_game()
+        session_id = next(self.session_ids)
+        sessions[session_id] = engine
+        self.open_sessions += 1
+        costs = " ".join(str(card.mana_cost) for card in engine.field.grid[1])
+        return f"ok {session_id} {costs}"
+
+    async def cmd_play(self, sessions: Sessions, args: List[str]) -> str:
+        if len(args) != 3:
+            raise CommandError("syntax")
+        engine = self.session(sessions, args[0])
+        col, slot = parse_ints(args[1:], 2)
+        if is_finished(engine):
+            raise CommandError("over")
+        rejections: List[PlayRejected] = []
+        engine.bus.subscribe(PlayRejected, rejections.append)
+        try:
+            engine.play_card(1, col, slot, is_player=True)
+        finally:
+            engine.bus.unsubscribe(PlayRejected, rejections.append)
+        if rejections:
+            raise CommandError(rejections[0].reason)
+        return f"ok {format_state(engine)}"
+
+    async def cmd_end(self, sessions: Sessions, args: List[str]) -> str:
+        if len(args) != 1:
+            raise CommandError("syntax")
+        engine = self.session(sessions, args[0])
+        if is_finished(engine):
+            raise CommandError("over")
+        if self.executor is None:
+            run_instantly(engine.next_turn_steps())
+        else:
+            await asyncio.get_running_loop().run_in_executor(self.executor, run_instantly, engine.next_turn_steps())
+        if is_finished(engine):
+            self.finished_matches += 1
+        return f"ok {format_state(engine)}"
+
+    async def cmd_state(self, sessions: Sessions, args: List[str]) -> str:
+        if len(args) != 1:
+            raise CommandError("syntax")
+        return f"ok {format_state(self.session(sessions, args[0]))}"
+
+    async def cmd_close(self, sessions: Sessions, args: List[str]) -> str:
+        if len(args) != 1:
+            raise CommandError("syntax")
+        self.session(sessions, args[0])
+        del sessions[int(args[0])]
+        self.open_sessions -= 1
+        return "ok"
+
+    async def cmd_stats(self, sessions: Sessions, args: List[str]) -> str:
+        return f"ok {self.open_sessions} {self.finished_matches}"
+
+    async def serve(self, host: str = "127.0.0.1", port: int = 8765, unix: Optional[str] = None) -> None:
+        """Принимает соединения по TCP или Unix-сокету до отмены задачи."""
+        if unix:
+            server = await asyncio.start_unix_server(self.handle, path=unix)
+        else:
+            server = await asyncio.start_server(self.handle, host, port)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            if self.executor is not None:
+                self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+def main() -> None:
+    """Разбирает аргументы командной строки и запускает сервер."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Сервер партий против AI.")
+    parser.add_argument("--host", default="127.0.0.1", help="Адрес TCP")
+    parser.add_argument("--port", type=int, default=8765, help="Порт TCP")
+    parser.add_argument("--unix", help="Путь Unix-сокета вместо TCP")
+    parser.add_argument("--workers", type=int, default=4, help="Потоков для ходов AI (0 — в цикле событий)")
+    parser.add_argument("--max-sessions", type=int, default=100_000, help="Предел открытых сессий")
+    args = parser.parse_args()
+
+    server = GameServer(workers=args.workers, max_sessions=args.max_sessions)
+    try:
+        asyncio.run(server.serve(args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
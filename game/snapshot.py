@@ -0,0 +1,167 @@
+# game/snapshot.py
+"""Снимки состояния партии с копированием при записи: ветвление, отмена и повтор.
+
+Снимок (GameSnapshot) неизменяем и делит с предыдущим снимком все, что не
+изменилось: состояния слотов, кортежи сторон, игроков и сетку карт. Поле
+отмечает изменившиеся слоты в масках GameField.dirty, поэтому новый снимок
+строится за O(изменившихся слотов). Восстановление снимка в движок
+переписывает только слоты, отличающиеся от текущего состояния движка,
+поэтому один рабочий движок можно много раз возвращать к снимку вместо
+создания копий (так делает MCTSPolicy).
+
+Снимки берутся между шагами хода, когда список pending_removals пуст.
+Генератор случайных чисел движка в снимок не входит.
+"""
+import dataclasses
+import random
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, List, Optional
+
+from game.core import Card, Creature, MASK_SLOTS
+from game.engine import GameEngine
+
+SlotState = Optional[tuple[int, int, bool]]  # (id карты, здоровье, активность) или None для пустого слота
+Side = tuple[SlotState, ...]
+
+
+def slot_state(creature: Optional[Creature]) -> SlotState:
+    """Неизменяемое состояние слота."""
+    return None if creature is None else (creature.card_id, creature.health, creature.active)
+
+
+@dataclass(frozen=True, slots=True)
+class GameSnapshot:
+    """Неизменяемое состояние партии."""
+    turn: int
+    opponent_turn: int
+    player: tuple[int, int]     # Здоровье и мана игрока
+    opponent: tuple[int, int]   # Здоровье и мана оппонента
+    sides: tuple[Side, Side]    # Слоты оппонента и игрока
+    grid: List[List[Optional[Card]]] = dataclasses.field(compare=False)  # Сетка общая: карты неизменяемы
+
+
+def take_snapshot(engine: GameEngine, base: Optional[GameSnapshot] = None) -> GameSnapshot:
+    """Снимает состояние движка.
+
+    Аргументы:
+        engine (GameEngine): Движок.
+        base (GameSnapshot, optional): Предыдущий снимок этого же движка, после которого маски
+            изменившихся слотов не сбрасывались. Пересобираются только отмеченные слоты,
+            остальное берется из base, а маски сбрасываются, поэтому у движка должен быть
+            один владелец цепочки снимков (например, StateHistory). Без base снимок строится
+            целиком и маски не трогает.
+    """
+    field = engine.field
+    sides = []
+    for side in (0, 1):
+        creatures = field.get_creatures(side == 1)
+        if base is None:
+            states = tuple(slot_state(creature) for creature in creatures)
+        else:
+            states = base.sides[side]
+            mask = field.dirty[side]
+            if mask:
+                changed = list(states)
+                for slot in MASK_SLOTS[mask]:
+                    changed[slot] = slot_state(creatures[slot])
+                states = tuple(changed)
+            field.dirty[side] = 0
+        sides.append(states)
+
+    player = (engine.player.health, engine.player.mana)
+    opponent = (engine.opponent.health, engine.opponent.mana)
+    if base is not None:
+        # Совпадающие части берутся из base, чтобы сравнение снимков обходилось проверкой тождественности
+        player = base.player if base.player == player else player
+        opponent = base.opponent if base.opponent == opponent else opponent
+        sides = [old if old == new else new for old, new in zip(base.sides, sides)]
+    return GameSnapshot(engine.turn, engine.opponent_turn, player, opponent, (sides[0], sides[1]), field.grid)
+
+
+def restore(engine: GameEngine, snapshot: GameSnapshot, base: Optional[GameSnapshot] = None) -> None:
+    """Приводит движок к состоянию снимка.
+
+    Аргументы:
+        engine (GameEngine): Движок.
+        snapshot (GameSnapshot): Целевое состояние.
+        base (GameSnapshot, optional): Последний снимок этого движка (take_snapshot или restore);
+            тогда переписываются только слоты, отличающиеся от текущего состояния.
+            Без base переписываются все слоты.
+    """
+    field = engine.field
+    if field.grid is not snapshot.grid:
+        field.grid = snapshot.grid
+    current = take_snapshot(engine, base) if base is not None else None
+    for side in (0, 1):
+        target = snapshot.sides[side]
+        now = current.sides[side] if current is not None else None
+        if now is target:
+            continue
+        for slot, state in enumerate(target):
+            if now is None or now[slot] != state:
+                field.set_creature(slot, side == 1, None if state is None else Creature(*state))
+        field.dirty[side] = 0
+
+    engine.turn, engine.opponent_turn = snapshot.turn, snapshot.opponent_turn
+    engine.player.health, engine.player.mana = snapshot.player
+    engine.opponent.health, engine.opponent.mana = snapshot.opponent
+    engine.pending_removals.clear()
+
+
+def spawn(snapshot: GameSnapshot, rng: Optional[random.Random] = None, player_name: str = "Игрок 1") -> GameEngine:
+    """Создает новый безголовый движок в состоянии снимка."""
+    from game.headless import HeadlessEvents
+
+    engine = GameEngine(player_name, events=HeadlessEvents(), rng=rng)
+    restore(engine, snapshot)
+    return engine
+
+
+class StateHistory:
+    """История состояний движка: ветвление, отмена и повтор.
+
+    Аргументы:
+        engine (GameEngine): Движок, состояние которого сохраняется и восстанавливается.
+        limit (int): Максимальная глубина отмены.
+    """
+
+    def __init__(self, engine: GameEngine, limit: int = 1000) -> None:
+        self.engine = engine
+        self.current = take_snapshot(engine)
+        self.undo_stack: Deque[GameSnapshot] = deque(maxlen=limit)
+        self.redo_stack: List[GameSnapshot] = []
+
+    def fork(self) -> GameSnapshot:
+        """Снимок текущего состояния для ветвления: O(изменившихся с прошлого снимка слотов).
+
+        Ветвь продолжается в любом движке через restore() или spawn().
+        """
+        self.current = take_snapshot(self.engine, self.current)
+        return self.current
+
+    def checkpoint(self) -> None:
+        """Запоминает текущее состояние как точку отмены и очищает историю повтора."""
+        self.undo_stack.append(self.fork())
+        self.redo_stack.clear()
+
+    def undo(self) -> bool:
+        """Возвращает движок к последней точке отмены; False, если отменять нечего."""
+        if not self.undo_stack:
+            return False
+        self.redo_stack.append(self.fork())
+        self.move_to(self.undo_stack.pop())
+        return True
+
+    def redo(self) -> bool:
+        """Повторяет последнее отмененное; False, если повторять нечего."""
+        if not self.redo_stack:
+            return False
+        self.undo_stack.append(self.fork())
+        self.move_to(self.redo_stack.pop())
+        return True
+
+    def move_to(self, snapshot: GameSnapshot) -> None:
+        """Переводит движок в состояние снимка, переписывая только отличающиеся слоты."""
+        restore(self.engine, snapshot, self.current)
+        self.current = snapshot
@@ -0,0 +1,84 @@
+# game/timeline.py
+"""Очередь игровых действий с задержками и покадровый планировщик для их воспроизведения."""
+from dataclasses import dataclass
+from typing import Iterator, Optional
+
+
+@dataclass(slots=True)
+class TimedAction:
+    """Действие, которое движок выполнит после паузы.
+
+    Шаговые методы GameEngine выдают действие перед тем, как применить его
+    к состоянию игры; до этого момента на экране видно состояние «до».
+    """
+    kind: str              # "play", "attack", "counterattack", "removal" или "wait"
+    delay_ms: int          # Пауза перед выполнением действия
+    is_player: bool = False  # Сторона, выполняющая действие
+    slot: int = -1         # Слот на поле, если действие к нему относится
+
+
+Steps = Iterator[TimedAction]
+
+
+def run_instantly(steps: Steps) -> None:
+    """Выполняет все действия без пауз (режим перемотки и безголовые симуляции)."""
+    for _ in steps:
+        pass
+
+
+class Timeline:
+    """Покадровый планировщик: выполняет действия по мере истечения их пауз.
+
+    Вызывается из основного цикла с текущим временем, поэтому кадры
+    продолжают рисоваться, пока AI ходит или разрешается бой.
+    """
+
+    def __init__(self) -> None:
+        self.steps: Optional[Steps] = None
+        self.current: Optional[TimedAction] = None  # Действие, ожидающее выполнения
+        self.resume_at = 0
+        self.fast_forward = False  # Выполнять действия без пауз
+
+    @property
+    def busy(self) -> bool:
+        """Воспроизводится ли сейчас очередь действий."""
+        return self.steps is not None
+
+    def start(self, steps: Steps, now_ms: int) -> None:
+        """Начинает воспроизведение очереди действий.
+
+        Аргументы:
+            steps (Steps): Генератор действий, например GameEngine.next_turn_steps().
+            now_ms (int): Текущее время в миллисекундах.
+        """
+        self.steps = steps
+        self.resume_at = now_ms
+        self.update(now_ms)
+
+    def update(self, now_ms: int) -> bool:
+        """Выполняет все действия, пауза перед которыми истекла.
+
+        Аргументы:
+            now_ms (int): Текущее время в миллисекундах.
+
+        Возвращает:
+            bool: True, если состояние игры изменилось.
+        """
+        advanced = False
+        while self.steps is not None and (self.fast_forward or now_ms >= self.resume_at):
+            advanced = True
+            try:
+                self.current = next(self.steps)
+            except StopIteration:
+                self.steps = None
+                self.current = None
+                break
+            self.resume_at = now_ms + self.current.delay_ms
+        return advanced
+
+    def skip(self) -> None:
+        """Немедленно выполняет оставшиеся действия."""
+        if self.steps is not None:
+            run_instantly(self.steps)
+        self.steps = None
+        self.current = None
@@ -0,0 +1,135 @@
+# loadgen.py
+"""Генератор нагрузки для сервера партий (game/server.py).
+
+Каждый клиент держит одно соединение и играет партии подряд: случайная
+доступная карта в случайный свободный слот, затем конец хода. Время ответа
+замеряется для каждой команды.
+
+Пример:
+    python -m game.server --port 8765 &
+    python loadgen.py --clients 200 --matches 2000 --port 8765
+"""
+import argparse
+import asyncio
+import math
+import random
+import time
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+
+@dataclass
+class LoadReport:
+    """Итоги нагрузки: число партий, общее время и время ответа каждой команды в секундах."""
+    matches: int = 0
+    elapsed: float = 0.0
+    latencies: List[float] = field(default_factory=list)
+
+    @property
+    def matches_per_second(self) -> float:
+        return self.matches / self.elapsed if self.elapsed > 0 else 0.0
+
+    def percentile(self, q: float) -> float:
+        """Перцентиль времени ответа (q от 0 до 1) в секундах."""
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        return ordered[max(0, math.ceil(q * len(ordered)) - 1)]
+
+
+class Client:
+    """Соединение с сервером, замеряющее время ответа на каждую команду."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, report: LoadReport) -> None:
+        self.reader = reader
+        self.writer = writer
+        self.report = report
+
+    async def request(self, line: str) -> List[str]:
+        """Отправляет команду и возвращает слова ответа без "ok".
+
+        Исключения:
+            RuntimeError: Если сервер ответил ошибкой.
+        """
+        start = time.perf_counter()
+        self.writer.write(line.encode("utf-8") + b"\n")
+        reply = (await self.reader.readline()).decode("utf-8").split()
+        self.report.latencies.append(time.perf_counter() - start)
+        if not reply or reply[0] != "ok":
+            raise RuntimeError(f"{line}: {' '.join(reply) or 'соединение закрыто'}")
+        return reply[1:]
+
+    async def play_match(self, rng: random.Random, ai: str) -> None:
+        """Играет одну партию до конца и закрывает ее сессию."""
+        words = await self.request(f"new {rng.getrandbits(32)} {ai}")
+        session, costs = words[0], [int(word) for word in words[1:]]
+        state = await self.request(f"state {session}")
+        while state[5] == "-":
+            mana = int(state[2])
+            cols = [col for col, cost in enumerate(costs) if cost <= mana]
+            slots = [slot for slot, value in enumerate(state[6].split(",")) if value == "."]
+            if cols and slots:
+                state = await self.request(f"play {session} {rng.choice(cols)} {rng.choice(slots)}")
+            state = await self.request(f"end {session}")
+        await self.request(f"close {session}")
+        self.report.matches += 1
+
+
+async def run_client(connect, matches: List[int], seed: int, ai: str, report: LoadReport) -> None:
+    """Один клиент: берет номера партий из общего списка, пока он не опустеет."""
+    reader, writer = await connect()
+    client = Client(reader, writer, report)
+    rng = random.Random(seed)
+    try:
+        while matches:
+            matches.pop()
+            await client.play_match(rng, ai)
+    finally:
+        writer.close()
+
+
+async def run_load(clients: int, matches: int, host: str = "127.0.0.1", port: int = 8765,
+                   unix: Optional[str] = None, seed: int = 0, ai: str = "greedy") -> LoadReport:
+    """Играет matches партий с clients одновременных соединений.
+
+    Аргументы:
+        clients (int): Число одновременных соединений.
+        matches (int): Общее число партий.
+        host (str): Адрес сервера TCP.
+        port (int): Порт сервера TCP.
+        unix (str, optional): Путь Unix-сокета вместо TCP.
+        seed (int): Зерно выбора ходов и зерен партий.
+        ai (str): Стратегия AI на сервере.
+    """
+    if unix:
+        connect = lambda: asyncio.open_unix_connection(unix)
+    else:
+        connect = lambda: asyncio.open_connection(host, port)
+    report = LoadReport()
+    pending = list(range(matches))
+    start = time.perf_counter()
+    await asyncio.gather(*(run_client(connect, pending, seed + index, ai, report) for index in range(clients)))
+    report.elapsed = time.perf_counter() - start
+    return report
+
+
+def main() -> None:
+    """Разбирает аргументы командной строки и печатает итоги нагрузки."""
+    parser = argparse.ArgumentParser(description="Нагрузка на сервер партий.")
+    parser.add_argument("--clients", type=int, default=100, help="Одновременных соединений")
+    parser.add_argument("--matches", type=int, default=1000, help="Всего партий")
+    parser.add_argument("--host", default="127.0.0.1", help="Адрес TCP")
+    parser.add_argument("--port", type=int, default=8765, help="Порт TCP")
+    parser.add_argument("--unix", help="Путь Unix-сокета вместо TCP")
+    parser.add_argument("--seed", type=int, default=0, help="Зерно")
+    parser.add_argument("--ai", default="greedy", help="Стратегия AI на сервере")
+    args = parser.parse_args()
+
+    report = asyncio.run(run_load(args.clients, args.matches, args.host, args.port, args.unix, args.seed, args.ai))
+    print(f"Сыграно партий: {report.matches} за {report.elapsed:.2f} с ({report.matches_per_second:.1f} партий/с)")
+    print(f"Команд: {len(report.latencies)}, время ответа p50 {report.percentile(0.5) * 1000:.2f} мс, "
+          f"p99 {report.percentile(0.99) * 1000:.2f} мс")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,18 @@
 # main.py
+import argparse
+from game.bus import LogSink
 from game.engine import GameEngine
 from game.gui import GUI
+from game.policies import POLICIES, make_policy
 
 def main() -> None:
     """Основная функция для запуска игры."""
-    engine = GameEngine(player_name="Игрок 1")
+    parser = argparse.ArgumentParser(description="Карточная игра против AI.")
+    parser.add_argument("--ai", choices=sorted(POLICIES), default="greedy", help="Стратегия оппонента")
+    args = parser.parse_args()
+
+    engine = GameEngine(player_name="Игрок 1", ai_policy=make_policy(args.ai))
+    LogSink().attach(engine.bus)  # Журнал событий в консоль
     gui = GUI(engine)
     engine.set_gui(gui)  # Устанавливаем GUI после создания
     gui.run()
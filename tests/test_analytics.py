@@ -0,0 +1,35 @@
+# tests/test_analytics.py
+"""Накопители статистики из разных процессов складываются по одним и тем же картам."""
+import os
+import random
+import subprocess
+import sys
+
+import numpy as np
+
+from data.cards import get_random_grid
+from game.analytics import CardStats, analyze_batch
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+WORKER = """
+import sys
+from game.analytics import analyze_batch
+
+analyze_batch(("greedy", "random", 0, 40)).save_npz(sys.argv[1])
+"""
+
+
+def test_stats_ids_do_not_depend_on_catalog_order(tmp_path):
+    get_random_grid(random.Random(7))  # Лишние карты в CATALOG сдвигают id относительно другого процесса
+    local = analyze_batch(("greedy", "random", 0, 40))
+
+    path = str(tmp_path / "stats.npz")
+    subprocess.run([sys.executable, "-c", WORKER, path], cwd=ROOT, check=True)
+    remote = CardStats.load_npz(path)
+
+    assert local.plays.sum() > 0
+    for name, array in remote.counters().items():
+        assert np.array_equal(getattr(local, name), array), name
+    assert local.names == remote.names
+    assert local.costs == remote.costs
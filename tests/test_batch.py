@@ -0,0 +1,14 @@
+# tests/test_batch.py
+"""Пакетный бой совпадает со скалярным GameEngine.resolve_combat."""
+from game.batch import BatchBoard, random_engines
+
+
+def test_batch_combat_matches_scalar():
+    engines = random_engines(200, seed=0)
+    # Ход оппонента разрешается на полях после хода игрока, как в партии
+    for is_player_turn in (True, False):
+        board = BatchBoard.from_engines(engines)
+        board.resolve_combat(is_player_turn)
+        for engine in engines:
+            engine.resolve_combat(is_player_turn)
+        assert board.equals(BatchBoard.from_engines(engines)), f"ход игрока: {is_player_turn}"
@@ -0,0 +1,49 @@
+# tests/test_optimizer.py
+"""Проверка параметров эволюции и заполнение поколения при малом пуле карт."""
+import random
+
+import pytest
+
+from data.card_db import load_database
+from game.optimizer import DeckEvaluator, MatchupCache, canonical_deck, evolve, main
+
+
+@pytest.fixture
+def tiny_evaluator(tmp_path):
+    """Оценка колод над базой из двух карт: различных колод всего девять."""
+    source = tmp_path / "cards.csv"
+    source.write_text("name,mana_cost,attack,health\nГоблин,1,1,2\nТролль,2,2,3\n", encoding="utf-8")
+    database = load_database(str(source))
+    cache = MatchupCache(str(tmp_path / "matchups.sqlite"))
+    pool = [canonical_deck(database, [0] * 8), canonical_deck(database, [1] * 8)]
+    yield DeckEvaluator(database, pool, range(2), cache, block_size=2)
+    cache.close()
+    database.close()
+
+
+@pytest.mark.parametrize("population_size, elite", [(16, 0), (16, -1), (4, 5), (1, 1), (0, 0)])
+def test_evolve_rejects_bad_sizes(tiny_evaluator, population_size, elite):
+    with pytest.raises(ValueError):
+        evolve(tiny_evaluator, random.Random(0), [], population_size=population_size, generations=1, elite=elite)
+
+
+@pytest.mark.parametrize("seeds, block_size", [(range(2), 0), (range(2), -1), (range(0), 2)])
+def test_evaluator_rejects_bad_blocks(tiny_evaluator, seeds, block_size):
+    with pytest.raises(ValueError):
+        DeckEvaluator(tiny_evaluator.database, tiny_evaluator.pool, seeds, tiny_evaluator.cache, block_size=block_size)
+
+
+@pytest.mark.parametrize("argv", [["--block-size", "0"], ["--seeds", "0"], ["--seeds", "-3"]])
+def test_main_rejects_bad_blocks(monkeypatch, capsys, argv):
+    monkeypatch.setattr("sys.argv", ["optimizer"] + argv)
+    with pytest.raises(SystemExit) as exit_info:
+        main()
+    assert exit_info.value.code == 2
+    assert "зерно" in capsys.readouterr().err
+
+
+def test_evolve_fills_population_beyond_distinct_decks(tiny_evaluator):
+    evaluations = evolve(tiny_evaluator, random.Random(0), tiny_evaluator.pool,
+                         population_size=12, generations=3, elite=2)
+    assert len(evaluations) == 12
+    assert len({evaluation.deck for evaluation in evaluations}) <= 9
@@ -0,0 +1,61 @@
+# tests/test_replay.py
+"""Реплей, записанный в одном процессе, читается в другом с теми же картами."""
+import json
+import os
+import random
+import subprocess
+import sys
+
+from data.cards import get_random_grid
+from game.bus import StateChanged
+from game.core import CATALOG
+from game.headless import simulate_game
+from game.replay import ReplayWriter
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+READER = """
+import json, sys
+from game.core import CATALOG
+from game.replay import ReplayReader
+
+with ReplayReader(sys.argv[1]) as reader:
+    boards = {}
+    for turn in json.loads(sys.argv[2]):
+        engine = reader.state_at(turn)
+        boards[turn] = [[None if creature is None else CATALOG[creature.card_id].name
+                         for creature in engine.field.get_creatures(is_player)] for is_player in (False, True)]
+print(json.dumps(boards))
+"""
+
+
+def board_names(engine) -> list:
+    """Названия карт в слотах обеих сторон."""
+    return [[None if creature is None else CATALOG[creature.card_id].name
+             for creature in engine.field.get_creatures(is_player)] for is_player in (False, True)]
+
+
+def test_replay_of_random_grid_reads_in_another_process(tmp_path):
+    rng = random.Random(7)
+    get_random_grid(rng)  # Лишние карты в CATALOG сдвигают id относительно читающего процесса
+    grid = get_random_grid(rng)
+    boards = {}
+
+    class TurnBoards:
+        """Запоминает расстановку карт в начале каждого хода."""
+
+        def attach(self, engine) -> None:
+            engine.bus.subscribe(StateChanged, self.on_state_changed)
+
+        def on_state_changed(self, event: StateChanged) -> None:
+            if event.cause == "turn":
+                boards.setdefault(event.engine.turn, board_names(event.engine))
+
+    path = str(tmp_path / "game.replay")
+    with ReplayWriter(path, interval=3) as writer:
+        simulate_game(11, replay=writer, observers=[TurnBoards()], grid=grid)
+    assert any(name for board in boards.values() for side in board for name in side)
+
+    output = subprocess.run([sys.executable, "-c", READER, path, json.dumps(sorted(boards))],
+                            cwd=ROOT, capture_output=True, text=True, check=True).stdout
+    assert {int(turn): board for turn, board in json.loads(output).items()} == boards
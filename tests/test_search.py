@@ -0,0 +1,23 @@
+# tests/test_search.py
+"""Хеш позиции для таблицы транспозиций различает сетки карт."""
+import random
+
+from data.cards import get_initial_grid, get_random_grid
+from game.engine import GameEngine
+from game.headless import HeadlessEvents
+from game.search import ZobristHasher
+
+
+def started_engine(grid) -> GameEngine:
+    engine = GameEngine(player_name="Игрок 1", events=HeadlessEvents(), rng=random.Random(0))
+    engine.start_game(grid)
+    return engine
+
+
+def test_hash_depends_on_grid():
+    hasher = ZobristHasher()
+    initial = started_engine(get_initial_grid())
+    other = started_engine(get_random_grid(random.Random(3)))
+    assert hasher.hash(initial, True) != hasher.hash(other, True)
+    # Та же сетка в другом движке дает тот же хеш: транспозиции между партиями сохраняются
+    assert hasher.hash(initial, True) == hasher.hash(started_engine(get_initial_grid()), True)
@@ -0,0 +1,30 @@
+# tests/test_snapshot.py
+"""Снимки, ветвление, отмена и повтор сверяются с независимым захватом состояния реплеев."""
+from game.batch import random_engines
+from game.policies import greedy_policy
+from game.replay import capture_state
+from game.snapshot import StateHistory, spawn
+
+
+def test_fork_undo_redo_match_captured_states():
+    for engine in random_engines(50, seed=0):
+        history = StateHistory(engine)
+        saved = []
+        for _ in range(4):
+            history.checkpoint()
+            saved.append(capture_state(engine))
+            move = greedy_policy(engine, True)
+            if move is not None:
+                engine.play_card(1, move[0], move[1], is_player=True)
+            engine.next_turn()
+        final = capture_state(engine)
+
+        assert capture_state(spawn(history.fork())) == final
+        for expected in reversed(saved):
+            assert history.undo()
+            assert capture_state(engine) == expected
+        assert not history.undo()
+        for expected in saved[1:] + [final]:
+            assert history.redo()
+            assert capture_state(engine) == expected
+        assert not history.redo()
@@ -0,0 +1,84 @@
+# tournament.py
+"""Турнир AI против AI в безголовом режиме на пуле процессов.
+
+Пример:
+    python tournament.py greedy random --games 10000 --workers 8 --seed 42
+"""
+import argparse
+import time
+from typing import Iterator, List
+
+from game.headless import play_seeded_match, run_batches
+from game.policies import POLICIES
+
+# Итог партии с точки зрения стратегии A: 1 — победа A, -1 — победа B, 0 — ничья
+MatchRecord = tuple[int, int, int]  # (зерно, итог, число ходов)
+
+
+def play_batch(args: tuple[str, str, List[int]]) -> List[MatchRecord]:
+    """Играет пачку партий в рабочем процессе.
+
+    Каждая партия получает собственный движок и генератор, инициализированный
+    своим зерном, поэтому итог не зависит от того, какой процесс ее сыграл.
+    При четном зерне стратегия A играет за игрока, при нечетном — за оппонента.
+    """
+    policy_a, policy_b, seeds = args
+    records = []
+    for seed in seeds:
+        outcome, result = play_seeded_match(seed, policy_a, policy_b)
+        records.append((seed, outcome, result.turns))
+    return records
+
+
+def batches(policy_a: str, policy_b: str, seeds: range, batch_size: int) -> Iterator[tuple[str, str, List[int]]]:
+    """Делит зерна турнира на пачки для рабочих процессов."""
+    for start in range(0, len(seeds), batch_size):
+        yield policy_a, policy_b, list(seeds[start:start + batch_size])
+
+
+def run_tournament(policy_a: str, policy_b: str, games: int, seed: int = 0,
+                   workers: int = 0, batch_size: int = 256) -> List[MatchRecord]:
+    """Проводит турнир и возвращает записи партий, упорядоченные по зерну.
+
+    Аргументы:
+        policy_a (str): Имя первой стратегии.
+        policy_b (str): Имя второй стратегии.
+        games (int): Число партий.
+        seed (int): Зерно первой партии; партия i играется с зерном seed + i.
+        workers (int): Число процессов; 0 — по числу ядер, 1 — без пула.
+        batch_size (int): Число партий в одной пачке, передаваемой процессу.
+    """
+    seeds = range(seed, seed + games)
+    jobs = batches(policy_a, policy_b, seeds, batch_size)
+    records: List[MatchRecord] = []
+    for batch in run_batches(play_batch, jobs, workers):
+        records.extend(batch)
+    records.sort()
+    return records
+
+
+def main() -> None:
+    """Разбирает аргументы командной строки и печатает итоги турнира."""
+    parser = argparse.ArgumentParser(description="Турнир стратегий AI в безголовом режиме.")
+    parser.add_argument("policy_a", choices=sorted(POLICIES), help="Первая стратегия")
+    parser.add_argument("policy_b", choices=sorted(POLICIES), help="Вторая стратегия")
+    parser.add_argument("--games", type=int, default=1000, help="Число партий")
+    parser.add_argument("--seed", type=int, default=0, help="Зерно первой партии")
+    parser.add_argument("--workers", type=int, default=0, help="Число процессов (0 — по числу ядер)")
+    parser.add_argument("--batch-size", type=int, default=256, help="Партий в одной пачке")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    records = run_tournament(args.policy_a, args.policy_b, args.games, seed=args.seed,
+                             workers=args.workers, batch_size=args.batch_size)
+    elapsed = time.perf_counter() - start
+
+    wins_a = sum(1 for _, outcome, _ in records if outcome == 1)
+    wins_b = sum(1 for _, outcome, _ in records if outcome == -1)
+    draws = len(records) - wins_a - wins_b
+    print(f"{args.policy_a}: {wins_a} побед, {args.policy_b}: {wins_b} побед, ничьих: {draws}")
+    print(f"Сыграно партий: {len(records)} за {elapsed:.2f} с ({len(records) / elapsed:.0f} партий/с)")
+
+
+if __name__ == "__main__":
+    main()